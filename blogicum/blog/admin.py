@@ -1,9 +1,16 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post, Comment
+from .models import Category, Location, Post, Comment, Job
 
 
 admin.site.register(Category)
 admin.site.register(Location)
 admin.site.register(Post)
 admin.site.register(Comment)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_at", "duration")
+    list_filter = ("status", "name")
+    readonly_fields = ("started_at", "finished_at", "duration", "last_error")
@@ -0,0 +1,71 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .cache import get_cached_page, get_page_cache
+from .views import CategoryView, IndexView, ProfileView, post_detail
+
+
+def _render_view(view, request, *args, **kwargs):
+    """
+    Вызывает синхронный view и рендерит TemplateResponse на месте:
+    ленивые запросы шаблона должны выполниться в том же потоке.
+    """
+    response = view(request, *args, **kwargs)
+    if not getattr(response, "is_rendered", True):
+        response.render()
+    return response
+
+
+def _may_be_anonymous(request):
+    # Без cookie сессии пользователь точно анонимный, и это можно
+    # проверить без обращения к базе данных.
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+async def _get_cached_page(request, scoped_pks):
+    if isinstance(get_page_cache(), (LocMemCache, DummyCache)):
+        # Кэш в памяти процесса не блокирует цикл событий.
+        return get_cached_page(request, scoped_pks)[1]
+    _, response = await sync_to_async(get_cached_page)(request, scoped_pks)
+    return response
+
+
+def async_view(view, serve_cached=True):
+    """
+    Асинхронная обёртка над синхронным view для работы под ASGI.
+    Страница из кэша отдаётся анонимному пользователю прямо в цикле
+    событий, без перехода в пул потоков. Остальные запросы выполняются
+    целиком за один переход `sync_to_async`: в Django 3.2 нет
+    асинхронного ORM, а переход на каждый запрос к базе обходится дороже.
+    `serve_cached=False` отключает отдачу из кэша в цикле событий
+    для view, ответы которых требуют проверки в базе данных.
+    """
+    get_scopes = getattr(view, "page_cache_scopes", None)
+    if not serve_cached:
+        get_scopes = None
+    render = sync_to_async(_render_view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if get_scopes is not None and _may_be_anonymous(request):
+            response = await _get_cached_page(request, get_scopes(**kwargs))
+            if response is not None:
+                return response
+        return await render(view, request, *args, **kwargs)
+
+    return wrapper
+
+
+index = async_view(IndexView.as_view())
+category_posts = async_view(CategoryView.as_view())
+profile = async_view(ProfileView.as_view())
+# ETag и Last-Modified страницы публикации вычисляются лёгким запросом
+# к базе, поэтому она всегда проходит через синхронный view.
+post_detail = async_view(post_detail, serve_cached=False)
@@ -0,0 +1,9 @@
+from .data import generate_data
+from .runner import run_benchmark, run_connection_benchmark, run_throughput
+
+__all__ = [
+    "generate_data",
+    "run_benchmark",
+    "run_connection_benchmark",
+    "run_throughput",
+]
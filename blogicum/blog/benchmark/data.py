@@ -0,0 +1,117 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from blog.cache import bump_version
+from blog.models import Category, Comment, Location, Post, User
+from blog.publication import reset_publication_horizon
+from blog.search import index_posts
+from blog.utils import recount_comment_counts
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+def _bulk_create(model, objects, batch_size):
+    with transaction.atomic():
+        return model.objects.bulk_create(objects, batch_size=batch_size)
+
+
+def generate_data(
+    users=10,
+    categories=5,
+    locations=10,
+    posts=1000,
+    comments=5000,
+    batch_size=1000,
+    seed=None,
+):
+    """
+    Заполняет базу синтетическими пользователями, категориями,
+    местоположениями, публикациями и комментариями для замеров.
+    Около 5% публикаций отложены, столько же снято с публикации.
+    Возвращает словарь с количеством созданных объектов.
+    """
+    fake = Faker("ru_RU")
+    rnd = random.Random(seed)
+    if seed is not None:
+        fake.seed_instance(seed)
+    now = timezone.now()
+    password = make_password(BENCHMARK_PASSWORD)
+
+    prefix = fake.unique.bothify("bench-????-")
+    _bulk_create(
+        User,
+        [
+            User(username=f"{prefix}{i}", password=password)
+            for i in range(users)
+        ],
+        batch_size,
+    )
+    _bulk_create(
+        Category,
+        [
+            Category(
+                title=fake.sentence(nb_words=2),
+                slug=f"{prefix}{i}",
+                description=fake.paragraph(),
+            )
+            for i in range(categories)
+        ],
+        batch_size,
+    )
+    _bulk_create(
+        Location,
+        [Location(name=fake.city()) for _ in range(locations)],
+        batch_size,
+    )
+    authors = list(User.objects.filter(username__startswith=prefix))
+    category_objs = list(Category.objects.filter(slug__startswith=prefix))
+    location_objs = list(Location.objects.order_by("-pk")[:locations])
+
+    for start in range(0, posts, batch_size):
+        chunk = [
+            Post(
+                title=fake.sentence(nb_words=4)[:256],
+                text=fake.text(max_nb_chars=1000),
+                pub_date=now + timedelta(minutes=rnd.randint(-525600, 10080)),
+                is_published=rnd.random() > 0.05,
+                author=rnd.choice(authors),
+                category=rnd.choice(category_objs),
+                location=rnd.choice(location_objs + [None]),
+            )
+            for _ in range(min(batch_size, posts - start))
+        ]
+        _bulk_create(Post, chunk, batch_size)
+    post_ids = list(
+        Post.objects.filter(author__in=authors).values_list("pk", flat=True)
+    )
+
+    if not post_ids:
+        comments = 0
+    for start in range(0, comments, batch_size):
+        chunk = [
+            Comment(
+                post_id=rnd.choice(post_ids),
+                author=rnd.choice(authors),
+                text=fake.sentence(),
+            )
+            for _ in range(min(batch_size, comments - start))
+        ]
+        _bulk_create(Comment, chunk, batch_size)
+    recount_comment_counts(post_ids, batch_size=batch_size)
+    for start in range(0, len(post_ids), batch_size):
+        index_posts(post_ids[start: start + batch_size])
+    bump_version("site", "taxonomy")
+    reset_publication_horizon()
+
+    return {
+        "users": len(authors),
+        "categories": len(category_objs),
+        "locations": len(location_objs),
+        "posts": len(post_ids),
+        "comments": comments,
+    }
@@ -0,0 +1,315 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils.http import urlencode
+
+from blog.instrumentation import count_queries
+from blog.models import Comment, Post
+
+PERCENTILES = (50, 90, 95, 99)
+
+THROUGHPUT_URL_NAMES = (
+    "blog:index",
+    "blog:category_posts",
+    "blog:profile",
+    "blog:post_detail",
+)
+
+FEED_URL_NAMES = (
+    "blog:index",
+    "blog:category_posts",
+    "blog:profile",
+)
+
+URL_KWARG_SOURCES = {
+    "blog:edit_comment": {"pk": "comment_id"},
+}
+
+POST_ONLY_URL_NAMES = {"blog:add_comment"}
+
+URL_QUERY_SOURCES = {
+    "blog:search": {"q": "search_query"},
+}
+
+
+def _iter_patterns(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in ("blog", "pages"):
+                yield from _iter_patterns(
+                    pattern.url_patterns, pattern.namespace
+                )
+        elif isinstance(pattern, URLPattern) and namespace and pattern.name:
+            yield f"{namespace}:{pattern.name}", pattern
+
+
+def _sample_kwargs():
+    """
+    Подбирает значения аргументов URL по данным из базы:
+    опубликованную публикацию с комментарием, её категорию и автора.
+    """
+    post = (
+        Post.published_posts.filter(comment_count__gt=0)
+        .order_by("-comment_count")
+        .first()
+        or Post.published_posts.first()
+    )
+    if post is None:
+        return None, {}
+    comment = Comment.objects.filter(post=post).first()
+    return post.author, {
+        "pk": post.pk,
+        "post_id": post.pk,
+        "slug": post.category.slug,
+        "username": post.author.username,
+        "comment_id": comment.pk if comment else None,
+        "search_query": post.title.split()[0] if post.title else None,
+    }
+
+
+def collect_urls():
+    """
+    Возвращает пары (имя URL, адрес) для всех маршрутов приложений
+    blog и pages, подставляя в параметры реальные объекты из базы.
+    """
+    author, samples = _sample_kwargs()
+    urls = []
+    for view_name, pattern in _iter_patterns(get_resolver().url_patterns):
+        if view_name in POST_ONLY_URL_NAMES:
+            continue
+        sources = URL_KWARG_SOURCES.get(view_name, {})
+        kwargs = {
+            name: samples.get(sources.get(name, name))
+            for name in pattern.pattern.converters
+        }
+        query = {
+            name: samples.get(source)
+            for name, source in URL_QUERY_SOURCES.get(view_name, {}).items()
+        }
+        if None in kwargs.values() or None in query.values():
+            continue
+        url = reverse(view_name, kwargs=kwargs)
+        if query:
+            url += "?" + urlencode(query)
+        urls.append((view_name, url))
+    return author, urls
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, round(percent / 100 * len(ordered)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _measure(client, url, requests, warmup, close_connections=False):
+    """
+    `close_connections` повторяет поведение WSGI-сервера, который
+    по окончании запроса закрывает устаревшие соединения с базой;
+    тестовый клиент Django этого не делает.
+    """
+    for _ in range(warmup):
+        client.get(url)
+        if close_connections:
+            close_old_connections()
+    latencies = []
+    queries = []
+    connects = []
+    connect_times = []
+    statuses = set()
+    for _ in range(requests):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+        if close_connections:
+            close_old_connections()
+        queries.append(counter.queries)
+        connects.append(counter.connects)
+        connect_times.append(counter.connect_time * 1000)
+        statuses.add(response.status_code)
+    result = {
+        "requests": requests,
+        "status_codes": sorted(statuses),
+        "latency_ms": {
+            "mean": statistics.mean(latencies),
+            "min": min(latencies),
+            "max": max(latencies),
+        },
+        "queries": {
+            "mean": statistics.mean(queries),
+            "max": max(queries),
+        },
+        "connections": {
+            "opened": sum(connects),
+            "mean_connect_ms": statistics.mean(connect_times),
+        },
+        "rps": requests / (sum(latencies) / 1000),
+    }
+    for percent in PERCENTILES:
+        result["latency_ms"][f"p{percent}"] = _percentile(latencies, percent)
+    return result
+
+
+def run_benchmark(requests=50, warmup=5, clients=("anonymous", "author")):
+    """
+    Замеряет задержки и количество SQL-запросов на каждый URL
+    приложений blog и pages для анонимного пользователя
+    и для автора публикации. Возвращает список результатов.
+    """
+    author, urls = collect_urls()
+    sessions = {}
+    if "anonymous" in clients:
+        sessions["anonymous"] = Client(
+            SERVER_NAME="localhost", raise_request_exception=False
+        )
+    if "author" in clients and author is not None:
+        sessions["author"] = Client(
+            SERVER_NAME="localhost", raise_request_exception=False
+        )
+        sessions["author"].force_login(author)
+
+    results = []
+    for client_name, client in sessions.items():
+        for view_name, url in urls:
+            result = _measure(client, url, requests, warmup)
+            result.update(view_name=view_name, url=url, client=client_name)
+            results.append(result)
+    return results
+
+
+def run_connection_benchmark(requests=50, warmup=5, conn_max_age=60):
+    """
+    Сравнивает задержки лент для авторизованного пользователя
+    с соединением на каждый запрос (CONN_MAX_AGE = 0)
+    и с постоянными соединениями (CONN_MAX_AGE = `conn_max_age`).
+    """
+    author, urls = collect_urls()
+    urls = [(name, url) for name, url in urls if name in FEED_URL_NAMES]
+    client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+    if author is not None:
+        client.force_login(author)
+    original = {
+        connection.alias: connection.settings_dict["CONN_MAX_AGE"]
+        for connection in connections.all()
+    }
+    results = []
+    try:
+        for max_age in (0, conn_max_age):
+            for connection in connections.all():
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+            for view_name, url in urls:
+                result = _measure(
+                    client, url, requests, warmup, close_connections=True
+                )
+                result.update(
+                    view_name=view_name, url=url, conn_max_age=max_age
+                )
+                results.append(result)
+    finally:
+        for connection in connections.all():
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original[
+                connection.alias
+            ]
+    return results
+
+
+def _split(total, parts):
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+def _throughput_result(interface, results, elapsed, concurrency):
+    latencies = [value for latency, _ in results for value in latency]
+    statuses = {value for _, status in results for value in status}
+    result = {
+        "interface": interface,
+        "async_views": settings.BLOG_ASYNC_VIEWS,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "elapsed_s": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else None,
+        "status_codes": sorted(statuses),
+        "latency_ms": {},
+    }
+    for percent in PERCENTILES:
+        result["latency_ms"][f"p{percent}"] = _percentile(latencies, percent)
+    return result
+
+
+def _run_wsgi(urls, requests, concurrency):
+    def worker(count):
+        client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+        latencies, statuses = [], set()
+        try:
+            for i in range(count):
+                start = time.perf_counter()
+                response = client.get(urls[i % len(urls)])
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses.add(response.status_code)
+        finally:
+            if concurrency > 1:
+                connections.close_all()
+        return latencies, statuses
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        results = [worker(requests)]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(worker, _split(requests, concurrency)))
+    return results, time.perf_counter() - start
+
+
+async def _run_asgi(urls, requests, concurrency):
+    async def worker(count):
+        client = AsyncClient(
+            SERVER_NAME="localhost", raise_request_exception=False
+        )
+        latencies, statuses = [], set()
+        for i in range(count):
+            start = time.perf_counter()
+            response = await client.get(urls[i % len(urls)])
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.add(response.status_code)
+        return latencies, statuses
+
+    # AsyncClient в Django 3.2 всегда передаёт заголовок Host: testserver.
+    allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    with override_settings(ALLOWED_HOSTS=allowed_hosts):
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(worker(count) for count in _split(requests, concurrency))
+        )
+        return results, time.perf_counter() - start
+
+
+def run_throughput(requests=200, concurrency=10, interfaces=("wsgi", "asgi")):
+    """
+    Сравнивает пропускную способность страниц чтения под WSGI
+    (пул из `concurrency` потоков, как у многопоточного воркера)
+    и под ASGI (`concurrency` клиентов в одном цикле событий).
+    Асинхронные view включаются настройкой BLOG_ASYNC_VIEWS.
+    """
+    _, urls = collect_urls()
+    urls = [url for name, url in urls if name in THROUGHPUT_URL_NAMES]
+    if not urls:
+        return []
+    runners = {
+        "wsgi": _run_wsgi,
+        "asgi": async_to_sync(_run_asgi),
+    }
+    report = []
+    for interface in interfaces:
+        results, elapsed = runners[interface](urls, requests, concurrency)
+        report.append(
+            _throughput_result(interface, results, elapsed, concurrency)
+        )
+    return report
@@ -0,0 +1,181 @@
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .publication import publication_aware_timeout
+from .routers import read_from_replica
+
+POST_CARD_TEMPLATE = "includes/post_card.html"
+
+
+def get_cache():
+    return caches[settings.BLOG_CACHE_ALIAS]
+
+
+def _version_key(scope, pk):
+    return f"blog:version:{scope}:{pk}"
+
+
+def bump_version(scope, pk):
+    """
+    Меняет версию объекта: все закэшированные фрагменты,
+    в ключ которых входила прежняя версия, перестают использоваться.
+    """
+    get_cache().set(_version_key(scope, pk), uuid4().hex, None)
+
+
+def bump_versions(scope, pks):
+    """Меняет версии нескольких объектов одним обращением к кэшу."""
+    get_cache().set_many(
+        {_version_key(scope, pk): uuid4().hex for pk in pks}, None
+    )
+
+
+def get_versions(*scoped_pks):
+    """
+    Возвращает версии для пар (область, pk) одним обращением к кэшу.
+    Отсутствующая версия создаётся заново, поэтому вытеснение версии
+    из кэша никогда не возвращает к жизни устаревший фрагмент.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope, pk) for scope, pk in scoped_pks]
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def changed_at(resource, etag):
+    """
+    Момент, когда у ресурса появился текущий ETag. Last-Modified,
+    построенный так, сдвигается при любом изменении ETag, в том числе
+    при удалении данных, поэтому If-Modified-Since не даёт ложных 304.
+    Если запись вытеснена из кэша, время начинается заново: клиент
+    получит лишний ответ 200, но не устаревшую страницу.
+    """
+    cache = get_cache()
+    key = f"blog:changed_at:{resource}"
+    stored = cache.get(key)
+    if stored is not None and stored[0] == etag:
+        timestamp = stored[1]
+    else:
+        # HTTP-даты точны до секунды: новое время всегда позже прежнего.
+        timestamp = int(time.time())
+        if stored is not None:
+            timestamp = max(timestamp, stored[1] + 1)
+        cache.set(key, (etag, timestamp), None)
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def author_pk_cache_key(username):
+    return f"blog:author_pk:{username}"
+
+
+def post_card_cache_key(post):
+    versions = get_versions(
+        ("post", post.pk),
+        ("category", post.category_id),
+        ("location", post.location_id),
+        ("author", post.author_id),
+    )
+    return "blog:post_card:{}:{}:{}".format(
+        post.pk, post.updated_at.timestamp(), ":".join(versions)
+    )
+
+
+def render_post_card(post):
+    """Рендерит карточку публикации или берёт её из кэша."""
+    cache = get_cache()
+    key = post_card_cache_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(POST_CARD_TEMPLATE, {"post": post})
+        cache.set(key, html, settings.BLOG_FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def get_page_cache():
+    return caches[settings.BLOG_PAGE_CACHE_ALIAS]
+
+
+def page_cache_timeout():
+    return publication_aware_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT)
+
+
+def count_cache_key(scoped_pks):
+    versions = get_versions(("site", "taxonomy"), *scoped_pks)
+    return "blog:count:{}".format(":".join(versions))
+
+
+def page_cache_key(request, scoped_pks):
+    versions = get_versions(("site", "taxonomy"), *scoped_pks)
+    return "blog:page:{}:{}".format(
+        request.get_full_path(), ":".join(versions)
+    )
+
+
+def get_cached_page(request, scoped_pks):
+    """
+    Возвращает ключ кэша страницы и готовый ответ из кэша
+    (или None, если страницы в кэше нет).
+    """
+    key = page_cache_key(request, scoped_pks)
+    cached = get_page_cache().get(key)
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    return key, HttpResponse(content, content_type=content_type)
+
+
+def cache_anonymous_page(get_scopes):
+    """
+    Кэширует ответ страницы для анонимных пользователей.
+    `get_scopes` получает именованные аргументы из URL и возвращает
+    пары (область, pk), при смене версии которых страница устаревает.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ("GET", "HEAD")
+                or request.user.is_authenticated
+            ):
+                return view_func(request, *args, **kwargs)
+            key, cached = get_cached_page(request, get_scopes(**kwargs))
+            if cached is not None:
+                return cached
+
+            # Страница заполняет кэш под новой версией, поэтому читается
+            # из основной базы: отстающая реплика не должна попасть в кэш.
+            with read_from_replica(False):
+                response = view_func(request, *args, **kwargs)
+                if not getattr(response, "is_rendered", True):
+                    response.render()
+            if response.status_code == 200 and not response.cookies:
+                get_page_cache().set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    page_cache_timeout(),
+                )
+            return response
+
+        wrapper.page_cache_scopes = get_scopes
+        return wrapper
+
+    return decorator
+
+
+def invalidate_feeds(category_slugs):
+    bump_version("feed", "index")
+    for slug in category_slugs:
+        bump_version("category_feed", slug)
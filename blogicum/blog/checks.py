@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_task_worker(app_configs, **kwargs):
+    """
+    Задачи без обработчика не запустятся, а при немедленном
+    выполнении без обработчика не будет повторов упавших задач.
+    """
+    if settings.BLOG_TASKS_WORKER:
+        return []
+    if not settings.BLOG_TASKS_EAGER:
+        return [
+            Warning(
+                "Фоновые задачи ставятся в очередь, но не выполняются.",
+                hint=(
+                    "Запустите `manage.py run_jobs` и задайте "
+                    "BLOG_TASKS_WORKER=1 либо включите BLOG_TASKS_EAGER."
+                ),
+                id="blog.W001",
+            )
+        ]
+    if settings.DEBUG:
+        return []
+    return [
+        Warning(
+            "Фоновые задачи выполняются в потоке запроса, "
+            "а упавшие задачи не повторяются.",
+            hint=(
+                "Немедленное выполнение предназначено для разработки. "
+                "Запустите `manage.py run_jobs` и задайте "
+                "BLOG_TASKS_WORKER=1."
+            ),
+            id="blog.W002",
+        )
+    ]
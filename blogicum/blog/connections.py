@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+@receiver(request_started, dispatch_uid="blog_check_connections")
+def check_connections(**kwargs):
+    """
+    Проверяет постоянные соединения с базой перед их повторным
+    использованием в новом запросе. Соединение, которое закрыл сервер
+    или сетевое оборудование, закрывается и будет открыто заново
+    при первом запросе к базе, вместо ошибки посреди обработки.
+    Включается настройкой BLOG_DB_HEALTH_CHECKS.
+    """
+    if not settings.BLOG_DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if not connection.is_usable():
+            connection.close()
@@ -0,0 +1,105 @@
+import csv
+import json
+from datetime import datetime
+
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import Comment, Post
+
+# Выгружаемые поля: имя столбца и путь в ORM.
+EXPORTS = {
+    "posts": (
+        Post,
+        [
+            ("id", "pk"),
+            ("title", "title"),
+            ("text", "text"),
+            ("pub_date", "pub_date"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+            ("is_published", "is_published"),
+            ("author", "author__username"),
+            ("category", "category__slug"),
+            ("location", "location__name"),
+            ("comment_count", "comment_count"),
+            ("image", "image"),
+        ],
+    ),
+    "comments": (
+        Comment,
+        [
+            ("id", "pk"),
+            ("post", "post_id"),
+            ("author", "author__username"),
+            ("text", "text"),
+            ("created_at", "created_at"),
+        ],
+    ),
+}
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+CHUNK_SIZE = 2000
+
+
+def get_columns(name):
+    return [column for column, _ in EXPORTS[name][1]]
+
+
+def iter_rows(name, chunk_size=CHUNK_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Построчно читает таблицу через iterator(): на PostgreSQL это
+    серверный курсор, на остальных СУБД — выборка пачками, так что
+    в памяти не бывает больше `chunk_size` строк.
+    """
+    model, fields = EXPORTS[name]
+    return (
+        model.objects.using(using)
+        .order_by("pk")
+        .values_list(*[path for _, path in fields])
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_lines(name, rows, export_format="ndjson"):
+    """Строки файла выгрузки; для CSV первой идёт строка заголовка."""
+    columns = get_columns(name)
+    if export_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_serialize(value) for value in row])
+        return
+    for row in rows:
+        yield json.dumps(
+            dict(zip(columns, map(_serialize, row))), ensure_ascii=False
+        ) + "\n"
+
+
+def iter_export(
+    name, export_format="ndjson", chunk_size=CHUNK_SIZE, using=DEFAULT_DB_ALIAS
+):
+    """Файл выгрузки блоками по `chunk_size` строк."""
+    rows = iter_rows(name, chunk_size, using)
+    block = []
+    for line in iter_lines(name, rows, export_format):
+        block.append(line)
+        if len(block) >= chunk_size:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
@@ -0,0 +1,176 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+
+from .cache import (
+    author_pk_cache_key,
+    changed_at,
+    get_cache,
+    get_page_cache,
+    page_cache_key,
+    page_cache_timeout,
+)
+from .models import Category, Post, User
+from .routers import read_from_replica
+
+FEED_SIZE = 20
+
+
+def get_author_pk(username):
+    """
+    Первичный ключ автора по имени. Хранится в кэше, чтобы запрос
+    ленты из кэша не обращался к базе данных.
+    """
+    cache = get_cache()
+    key = author_pk_cache_key(username)
+    pk = cache.get(key)
+    if pk is None:
+        pk = get_object_or_404(User, username=username).pk
+        cache.set(key, pk, settings.BLOG_PAGE_CACHE_TIMEOUT)
+    return pk
+
+
+class CachedFeed(Feed):
+    """
+    Лента, которая сериализуется один раз на изменение содержимого.
+    Готовый XML хранится в кэше страниц под версиями из `get_scopes`,
+    а ETag и Last-Modified позволяют отвечать 304 без обращения к ORM.
+    Last-Modified берётся из момента смены ETag, а не из дат записей:
+    скрытие или удаление публикации тоже сдвигает его.
+    """
+
+    def get_scopes(self, **kwargs):
+        raise NotImplementedError
+
+    def __call__(self, request, *args, **kwargs):
+        key = page_cache_key(request, self.get_scopes(**kwargs))
+        cached = get_page_cache().get(key)
+        if cached is None:
+            # Содержимое кэшируется под текущими версиями, поэтому
+            # читается из основной базы, а не из отстающей реплики.
+            with read_from_replica(False):
+                response = super().__call__(request, *args, **kwargs)
+            cached = (
+                response.content,
+                response["Content-Type"],
+                quote_etag(md5(response.content).hexdigest()),
+            )
+            get_page_cache().set(key, cached, page_cache_timeout())
+        content, content_type, etag = cached
+        last_modified = int(
+            changed_at(f"feed:{request.path}", etag).timestamp()
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse("blog:post_detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return max(item.pub_date, item.updated_at)
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return [item.category.title] if item.category else []
+
+
+class LatestPostsFeed(CachedFeed):
+    title = "Блогикум"
+    description = "Новые публикации."
+
+    def get_scopes(self):
+        return [("feed", "index")]
+
+    def link(self):
+        return reverse("blog:index")
+
+    def items(self):
+        return Post.published_posts.order_by("-pub_date", "-id")[:FEED_SIZE]
+
+
+class CategoryPostsFeed(CachedFeed):
+    def get_scopes(self, slug):
+        return [("category_feed", slug)]
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug, is_published=True)
+
+    def title(self, category):
+        return f"Блогикум: {category.title}"
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse("blog:category_posts", args=[category.slug])
+
+    def items(self, category):
+        return Post.published_posts.filter(category=category).order_by(
+            "-pub_date", "-id"
+        )[:FEED_SIZE]
+
+
+class AuthorPostsFeed(CachedFeed):
+    def get_scopes(self, username):
+        pk = get_author_pk(username)
+        return [("author_feed", pk), ("author", pk)]
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f"Блогикум: {author.get_full_name() or author.username}"
+
+    def description(self, author):
+        return f"Публикации пользователя {author.username}."
+
+    def link(self, author):
+        return reverse("blog:profile", args=[author.username])
+
+    def items(self, author):
+        return Post.published_posts.filter(author=author).order_by(
+            "-pub_date", "-id"
+        )[:FEED_SIZE]
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj=None):
+        return self._get_dynamic_attr("description", obj)
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryPostsAtomFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
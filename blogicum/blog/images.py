@@ -0,0 +1,71 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+IMAGE_VARIANTS = {
+    "thumb": 640,
+    "detail": 1280,
+}
+IMAGE_FORMATS = {
+    "jpeg": (".jpg", "JPEG", {"quality": 82, "optimize": True}),
+    "webp": (".webp", "WEBP", {"quality": 80, "method": 4}),
+}
+
+
+def variant_name(name, variant, image_format):
+    """Имя производного файла рядом с оригиналом: photo.thumb.webp."""
+    root, _ = os.path.splitext(name)
+    extension = IMAGE_FORMATS[image_format][0]
+    return f"{root}.{variant}{extension}"
+
+
+def generate_image_variants(name, storage=default_storage):
+    """
+    Создаёт уменьшенные копии изображения в форматах JPEG и WebP
+    для всех размеров из IMAGE_VARIANTS. Изображения меньше нужной
+    ширины не увеличиваются, а копии одной и той же ширины
+    не дублируются. Возвращает {"source": имя оригинала,
+    "formats": {формат: [[ширина, имя файла], ...]}} с настоящей
+    шириной каждой копии: его хранит публикация.
+    """
+    with storage.open(name, "rb") as fh:
+        original = ImageOps.exif_transpose(Image.open(fh))
+        original = original.convert("RGB")
+    formats = {image_format: [] for image_format in IMAGE_FORMATS}
+    widths = set()
+    for variant, width in IMAGE_VARIANTS.items():
+        image = original.copy()
+        image.thumbnail((width, width * 4), Image.LANCZOS)
+        if image.width in widths:
+            continue
+        widths.add(image.width)
+        for image_format, (_, pil_format, options) in IMAGE_FORMATS.items():
+            buffer = BytesIO()
+            image.save(buffer, pil_format, **options)
+            target = variant_name(name, variant, image_format)
+            if storage.exists(target):
+                storage.delete(target)
+            content = ContentFile(buffer.getvalue())
+            formats[image_format].append(
+                [image.width, storage.save(target, content)]
+            )
+    return {"source": name, "formats": formats}
+
+
+def image_variant_urls(image, variants, storage=default_storage):
+    """
+    Возвращает {формат: [(ширина, url), ...]} по сохранённому
+    результату generate_image_variants. Если копии сделаны для другого
+    файла или ещё не созданы, словарь пуст и шаблоны используют
+    оригинал. Хранилище при этом не опрашивается.
+    """
+    if not variants or variants.get("source") != image.name:
+        return {}
+    return {
+        image_format: [(width, storage.url(name)) for width, name in files]
+        for image_format, files in variants["formats"].items()
+        if files
+    }
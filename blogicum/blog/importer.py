@@ -0,0 +1,362 @@
+import gzip
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from .cache import bump_version, bump_versions, invalidate_feeds
+from .publication import reset_publication_horizon
+from .search import index_posts
+from .utils import recount_comment_counts
+
+# Порядок записи: модели идут после тех, на которые ссылаются.
+IMPORT_MODELS = (
+    "auth.user",
+    "blog.category",
+    "blog.location",
+    "blog.post",
+    "blog.comment",
+)
+READ_SIZE = 64 * 1024
+# Предел размера одной записи: испорченный объект не должен заставить
+# импорт дочитать в память весь оставшийся файл.
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+
+class ImportDataError(Exception):
+    pass
+
+
+def open_input(path):
+    if path == "-":
+        return sys.stdin
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _skip_separators(buffer, position, in_array):
+    while position < len(buffer) and (
+        buffer[position].isspace() or (in_array and buffer[position] == ",")
+    ):
+        position += 1
+    return position
+
+
+def _read_rest_of_record(stream, buffer, error, in_array, read_size, limit):
+    """
+    Дочитывает запись, оборвавшуюся на границе блока. Если запись
+    уже не может стать корректной (строка NDJSON прочитана целиком
+    или запись длиннее `limit`), сразу сообщает об ошибке. Блоки
+    растут вместе с записью, поэтому длинная запись не разбирается
+    заново после каждого маленького блока.
+    """
+    if (not in_array and "\n" in buffer) or len(buffer) > limit:
+        raise ImportDataError(f"Некорректный JSON: {error}")
+    chunk = stream.read(max(read_size, len(buffer)))
+    if not chunk:
+        raise ImportDataError(f"Некорректный JSON: {error}")
+    return buffer + chunk
+
+
+def iter_records(
+    stream, read_size=READ_SIZE, max_record_size=MAX_RECORD_SIZE
+):
+    """
+    Читает объекты из JSON-массива (формат `dumpdata`) или из NDJSON,
+    не загружая файл в память целиком. Ошибка в записи NDJSON
+    обнаруживается, как только прочитана её строка; в массиве —
+    не позже, чем запись превысит `max_record_size`.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, in_array = "", 0, False
+    while True:
+        position = _skip_separators(buffer, position, in_array)
+        if position == len(buffer):
+            buffer, position = stream.read(read_size), 0
+            if not buffer:
+                break
+            continue
+        char = buffer[position]
+        if char in "[]" and in_array == (char == "]"):
+            in_array = not in_array
+            position += 1
+            continue
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            buffer = _read_rest_of_record(
+                stream,
+                buffer[position:],
+                error,
+                in_array,
+                read_size,
+                max_record_size,
+            )
+            position = 0
+            continue
+        if not isinstance(record, dict):
+            raise ImportDataError("Ожидались объекты с полями model и fields.")
+        yield record
+    if in_array:
+        raise ImportDataError("Не найдено окончание JSON-массива.")
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """
+    Отключает auto_now и auto_now_add, чтобы bulk_create сохранил
+    даты из файла, а не текущее время.
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class ContentImporter:
+    """
+    Массовый импорт пользователей, категорий, местоположений, публикаций
+    и комментариев. Внешние ключи проверяются по множествам известных
+    первичных ключей в памяти, записи пишутся через bulk_create пачками
+    по `batch_size`, каждые `chunk_size` записей — отдельная транзакция.
+    Записи, чьи первичные ключи уже есть в базе, пропускаются до вставки,
+    поэтому прерванный импорт можно просто запустить заново. Сигналы
+    моделей не отправляются: счётчики, поисковый индекс и кэш
+    обновляются пачками.
+    """
+
+    def __init__(
+        self,
+        batch_size=1000,
+        chunk_size=10000,
+        using=DEFAULT_DB_ALIAS,
+        progress=None,
+    ):
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.using = using
+        self.progress = progress
+        self.models = {label: apps.get_model(label) for label in IMPORT_MODELS}
+        self.pending = {label: [] for label in IMPORT_MODELS}
+        self.waiting = []
+        self.known_pks = {}
+        self.usernames = None
+        self.imported = Counter()
+        self.skipped = Counter()
+        self.commented_post_ids = set()
+        self.author_ids = set()
+        self.started = None
+
+    @property
+    def total(self):
+        return sum(self.imported.values())
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.total / elapsed if elapsed else 0.0
+
+    def run(self, records):
+        self.started = time.perf_counter()
+        buffered = 0
+        for record in records:
+            label = str(record.get("model", "")).lower()
+            if label not in self.models:
+                self.skipped[label or "?"] += 1
+                continue
+            try:
+                row = self.build(self.models[label], record)
+            except (TypeError, ValueError, ValidationError):
+                self.skipped[label] += 1
+                continue
+            self.add(label, row)
+            buffered += 1
+            if buffered >= self.chunk_size:
+                self.flush()
+                buffered = 0
+        self.flush()
+        for label, _ in self.waiting:
+            self.skipped[label] += 1
+        self.waiting = []
+        self.finish()
+        return self.imported, self.skipped
+
+    def build(self, model, record):
+        values = {}
+        if record.get("pk") is not None:
+            values[model._meta.pk.attname] = model._meta.pk.to_python(
+                record["pk"]
+            )
+        for name, value in record.get("fields", {}).items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if not field.concrete or field.many_to_many:
+                continue
+            if field.is_relation:
+                values[field.attname] = value
+            else:
+                values[field.attname] = field.to_python(value)
+        for field in model._meta.concrete_fields:
+            if (
+                getattr(field, "auto_now", False)
+                or getattr(field, "auto_now_add", False)
+            ) and values.get(field.attname) is None:
+                values[field.attname] = timezone.now()
+        return values
+
+    def add(self, label, values):
+        if not self.resolve(label, values):
+            # Запись ждёт, пока в файле не встретятся объекты,
+            # на которые она ссылается.
+            self.waiting.append((label, values))
+            return
+        pk = values.get(self.models[label]._meta.pk.attname)
+        if pk is None:
+            self.pending[label].append(values)
+            return
+        known_pks = self.get_known_pks(label)
+        if pk in known_pks:
+            # Запись уже есть в базе или встретилась в файле раньше.
+            self.skipped[label] += 1
+            return
+        known_pks.add(pk)
+        if label == "auth.user":
+            self.get_usernames()[values.get("username")] = pk
+        self.pending[label].append(values)
+
+    def get_known_pks(self, label):
+        if label not in self.known_pks:
+            self.known_pks[label] = set(
+                self.models[label]
+                .objects.using(self.using)
+                .values_list("pk", flat=True)
+                .iterator()
+            )
+        return self.known_pks[label]
+
+    def get_usernames(self):
+        if self.usernames is None:
+            user_model = self.models["auth.user"]
+            self.usernames = dict(
+                user_model.objects.using(self.using).values_list(
+                    user_model.USERNAME_FIELD, "pk"
+                )
+            )
+        return self.usernames
+
+    def resolve(self, label, values):
+        for field in self.models[label]._meta.concrete_fields:
+            if not field.is_relation or field.attname not in values:
+                continue
+            value = values[field.attname]
+            if value is None:
+                if field.null:
+                    continue
+                return False
+            target = field.related_model._meta.label_lower
+            if isinstance(value, list):
+                if target != "auth.user" or len(value) != 1:
+                    return False
+                value = self.get_usernames().get(value[0])
+            if value not in self.get_known_pks(target):
+                return False
+            values[field.attname] = value
+        return True
+
+    def flush(self):
+        waiting, self.waiting = self.waiting, []
+        for label, values in waiting:
+            self.add(label, values)
+        if not any(self.pending.values()):
+            return
+        with transaction.atomic(using=self.using):
+            for label, rows in self.pending.items():
+                if not rows:
+                    continue
+                model = self.models[label]
+                with preserve_timestamps(model):
+                    model.objects.using(self.using).bulk_create(
+                        [model(**values) for values in rows],
+                        batch_size=self.batch_size,
+                    )
+                self.imported[label] += len(rows)
+            posts = self.pending["blog.post"]
+            index_posts(
+                [values["id"] for values in posts if "id" in values],
+                connections[self.using],
+            )
+        self.author_ids.update(
+            values.get("author_id") for values in self.pending["blog.post"]
+        )
+        self.commented_post_ids.update(
+            values["post_id"] for values in self.pending["blog.comment"]
+        )
+        self.pending = {label: [] for label in IMPORT_MODELS}
+        if self.progress is not None:
+            self.progress(self)
+
+    def reset_sequences(self):
+        """
+        Сдвигает счётчики первичных ключей за импортированные записи,
+        как это делает `loaddata`: иначе на PostgreSQL следующий
+        create() получит уже занятый ключ.
+        """
+        models = [
+            model
+            for label, model in self.models.items()
+            if self.imported[label]
+        ]
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if not statements:
+            return
+        with transaction.atomic(using=self.using):
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def finish(self):
+        """
+        Обновляет счётчики первичных ключей и денормализованные данные,
+        сбрасывает кэш.
+        """
+        self.reset_sequences()
+        if self.commented_post_ids:
+            post_ids = sorted(self.commented_post_ids)
+            for start in range(0, len(post_ids), self.batch_size):
+                end = start + self.batch_size
+                recount_comment_counts(
+                    post_ids=post_ids[start:end],
+                    batch_size=self.batch_size,
+                    using=self.using,
+                )
+            bump_versions("post", self.commented_post_ids)
+        if self.imported["blog.post"] or self.commented_post_ids:
+            bump_versions("author_feed", self.author_ids - {None})
+            invalidate_feeds(
+                self.models["blog.category"]
+                .objects.using(self.using)
+                .values_list("slug", flat=True)
+            )
+        if self.imported["blog.category"] or self.imported["blog.location"]:
+            bump_version("site", "taxonomy")
+        reset_publication_horizon()
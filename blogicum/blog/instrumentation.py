@@ -0,0 +1,179 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_stats = {}
+_stats_lock = Lock()
+
+
+@dataclass
+class ViewQueryStats:
+    requests: int = 0
+    queries: int = 0
+    sql_time: float = 0.0
+    max_queries: int = 0
+    last_queries: int = 0
+    last_sql_time: float = 0.0
+    connects: int = 0
+    connect_time: float = 0.0
+
+    def add(self, queries, sql_time, connects=0, connect_time=0.0):
+        self.requests += 1
+        self.queries += queries
+        self.sql_time += sql_time
+        self.max_queries = max(self.max_queries, queries)
+        self.last_queries = queries
+        self.last_sql_time = sql_time
+        self.connects += connects
+        self.connect_time += connect_time
+
+
+class QueryCounter:
+    """
+    Обёртка выполнения SQL, считающая запросы и их суммарное время,
+    а также открытые соединения и время их установки.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.connects = 0
+        self.connect_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def time_connects(connection, counter):
+    """
+    Засекает время установки соединения внутри блока. Django 3.2
+    не сообщает о начале подключения, поэтому на время блока
+    подменяется `ensure_connection` у объекта соединения.
+    """
+    previous = connection.__dict__.get("ensure_connection")
+    ensure_connection = connection.ensure_connection
+
+    def timed_ensure_connection():
+        if connection.connection is not None:
+            return ensure_connection()
+        start = time.perf_counter()
+        try:
+            return ensure_connection()
+        finally:
+            counter.connect_time += time.perf_counter() - start
+            counter.connects += 1
+
+    connection.ensure_connection = timed_ensure_connection
+    try:
+        yield counter
+    finally:
+        if previous is None:
+            del connection.ensure_connection
+        else:
+            connection.ensure_connection = previous
+
+
+@contextmanager
+def count_queries():
+    """Считает SQL-запросы и подключения ко всем базам внутри блока."""
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+            stack.enter_context(time_connects(connection, counter))
+        yield counter
+
+
+def get_query_budget(view_name):
+    return settings.BLOG_QUERY_BUDGETS.get(view_name)
+
+
+def get_view_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_view_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def record_view_stats(
+    view_name, queries, sql_time, connects=0, connect_time=0.0
+):
+    with _stats_lock:
+        _stats.setdefault(view_name, ViewQueryStats()).add(
+            queries, sql_time, connects, connect_time
+        )
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Считает количество SQL-запросов и время их выполнения для каждого
+    запроса, копит статистику по имени view и сообщает в лог
+    о превышении бюджета запросов из `BLOG_QUERY_BUDGETS`.
+
+    Middleware только синхронное: соединения Django привязаны к потоку,
+    и под ASGI Django запускает его в том же потоке, куда затем
+    переходят синхронные view. В цикле событий счётчик не увидел бы
+    ни одного запроса.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        if not settings.BLOG_QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+        return self.record(request, response, counter)
+
+    def record(self, request, response, counter):
+        match = request.resolver_match
+        if match is None:
+            return response
+        view_name = match.view_name
+        record_view_stats(
+            view_name,
+            counter.queries,
+            counter.sql_time,
+            counter.connects,
+            counter.connect_time,
+        )
+        response["Server-Timing"] = (
+            'db;desc="{} queries";dur={:.2f}, '
+            'db-connect;desc="{} connections";dur={:.2f}'
+        ).format(
+            counter.queries,
+            counter.sql_time * 1000,
+            counter.connects,
+            counter.connect_time * 1000,
+        )
+        budget = get_query_budget(view_name)
+        if budget is not None and counter.queries > budget:
+            logger.warning(
+                "%s: %s SQL-запросов при бюджете %s (%s)",
+                view_name,
+                counter.queries,
+                budget,
+                request.path,
+            )
+        return response
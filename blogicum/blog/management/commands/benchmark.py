@@ -0,0 +1,131 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from blog.benchmark import (
+    generate_data,
+    run_benchmark,
+    run_connection_benchmark,
+    run_throughput,
+)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет задержки и количество SQL-запросов для всех страниц "
+        "блога; при необходимости сначала генерирует синтетические данные."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            action="store_true",
+            help="Сгенерировать данные перед замерами.",
+        )
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--categories", type=int, default=5)
+        parser.add_argument("--locations", type=int, default=10)
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--comments", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Количество замеряемых запросов на каждый URL.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Количество прогревочных запросов на каждый URL.",
+        )
+        parser.add_argument(
+            "--throughput",
+            action="store_true",
+            help="Сравнить пропускную способность под WSGI и ASGI.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            help="Количество одновременных клиентов в замере пропускной "
+            "способности.",
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=None,
+            help="Сравнить задержки лент без постоянных соединений "
+            "и с CONN_MAX_AGE, равным указанному значению.",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Файл для результатов в формате JSON ('-' — stdout).",
+        )
+
+    def handle(self, *args, **options):
+        generated = None
+        if options["generate"]:
+            generated = generate_data(
+                users=options["users"],
+                categories=options["categories"],
+                locations=options["locations"],
+                posts=options["posts"],
+                comments=options["comments"],
+                seed=options["seed"],
+            )
+            self.stderr.write(f"Сгенерировано: {generated}")
+
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "generated": generated,
+            "results": self.run(options),
+        }
+        if options["throughput"]:
+            report["throughput"] = run_throughput(
+                requests=options["requests"] * 4,
+                concurrency=options["concurrency"],
+            )
+        if options["conn_max_age"] is not None:
+            report["connections"] = run_connection_benchmark(
+                requests=options["requests"],
+                warmup=options["warmup"],
+                conn_max_age=options["conn_max_age"],
+            )
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(output)
+        else:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(output)
+            self.stderr.write(f"Результаты записаны в {options['output']}")
+
+    def run(self, options):
+        return run_benchmark(
+            requests=options["requests"], warmup=options["warmup"]
+        )
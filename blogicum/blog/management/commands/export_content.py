@@ -0,0 +1,71 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.export import (
+    CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORTS,
+    iter_lines,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Выгружает публикации или комментарии в NDJSON или CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS))
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_FORMATS),
+            default="ndjson",
+            help="Формат выгрузки.",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Файл для записи; по умолчанию стандартный вывод.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Количество строк, читаемых из базы за один раз.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="База данных, из которой читаются записи.",
+        )
+
+    def handle(self, *args, **options):
+        rows = iter_rows(
+            options["name"], options["chunk_size"], options["database"]
+        )
+        lines = iter_lines(options["name"], rows, options["format"])
+        started = time.perf_counter()
+        if options["output"] == "-":
+            written = self.write_lines(lines, sys.stdout)
+        else:
+            with open(
+                options["output"], "w", encoding="utf-8", newline=""
+            ) as output:
+                written = self.write_lines(lines, output)
+        if options["format"] == "csv":
+            written -= 1
+        elapsed = time.perf_counter() - started
+        self.stderr.write(
+            f"Выгружено записей: {written}, "
+            f"{written / elapsed if elapsed else 0:.0f} записей/с"
+        )
+
+    @staticmethod
+    def write_lines(lines, output):
+        written = 0
+        for line in lines:
+            output.write(line)
+            written += 1
+        return written
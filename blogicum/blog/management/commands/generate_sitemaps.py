@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновляет файлы карты сайта: переписывает только разделы, "
+        "в которых изменились публикации, категории или пользователи."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Переписать все файлы, даже если они не изменились.",
+        )
+
+    def handle(self, *args, **options):
+        stats = generate_sitemaps(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Записано файлов: {stats['written']}, "
+                f"без изменений: {stats['unchanged']}, "
+                f"удалено: {stats['removed']}"
+            )
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_version, invalidate_feeds
+from blog.images import generate_image_variants
+from blog.models import Category, Post
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии изображений публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать копии, даже если они уже существуют.",
+        )
+
+    def handle(self, *args, **options):
+        posts = (
+            Post.objects.exclude(image="")
+            .order_by("pk")
+            .values_list("pk", "image", "image_variant_files")
+        )
+        generated = skipped = failed = 0
+        for pk, name, variants in posts.iterator():
+            if not options["force"] and variants.get("source") == name:
+                skipped += 1
+                continue
+            try:
+                variants = generate_image_variants(name)
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f"{name}: {error}")
+                continue
+            Post.objects.filter(pk=pk, image=name).update(
+                image_variant_files=variants
+            )
+            bump_version("post", pk)
+            generated += 1
+        if generated:
+            invalidate_feeds(Category.objects.values_list("slug", flat=True))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано: {generated}, пропущено: {skipped}, "
+                f"ошибок: {failed}"
+            )
+        )
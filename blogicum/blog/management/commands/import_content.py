@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+
+from blog.importer import (
+    ContentImporter,
+    ImportDataError,
+    iter_records,
+    open_input,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Импортирует пользователей, категорий, местоположения, публикации "
+        "и комментарии из JSON (формат dumpdata) или NDJSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="Файл .json, .ndjson или .gz; «-» — стандартный ввод.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество записей в одном INSERT.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Количество записей в одной транзакции.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="База данных, в которую выполняется импорт.",
+        )
+
+    def handle(self, *args, **options):
+        importer = ContentImporter(
+            batch_size=options["batch_size"],
+            chunk_size=options["chunk_size"],
+            using=options["database"],
+            progress=self.report_progress,
+        )
+        try:
+            with open_input(options["path"]) as stream:
+                imported, skipped = importer.run(iter_records(stream))
+        except OSError as error:
+            raise CommandError(error)
+        except (ImportDataError, IntegrityError) as error:
+            raise CommandError(
+                f"Импорт остановлен после {importer.total} записей: {error}"
+            )
+        for label, count in sorted(imported.items()):
+            self.stdout.write(f"{label}: {count}")
+        for label, count in sorted(skipped.items()):
+            self.stdout.write(f"{label}: пропущено {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано записей: {importer.total}, "
+                f"{importer.rate():.0f} записей/с"
+            )
+        )
+
+    def report_progress(self, importer):
+        self.stderr.write(
+            f"Обработано {importer.total} записей, "
+            f"{importer.rate():.0f} записей/с"
+        )
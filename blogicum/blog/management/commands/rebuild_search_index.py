@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Перестраивает полнотекстовый индекс публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество публикаций, индексируемых за один проход.",
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано публикаций: {indexed}")
+        )
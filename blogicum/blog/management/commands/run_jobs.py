@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog.models import Job
+from blog.tasks import job_stats, purge_finished_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Выполняет фоновые задачи блога из очереди."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить готовые задачи и завершиться.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Количество задач, выполняемых за один проход.",
+        )
+        parser.add_argument(
+            "--purge-after",
+            type=int,
+            default=60 * 60 * 24 * 7,
+            help="Удалять выполненные задачи старше указанного числа секунд.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Вывести статистику очереди и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats()
+            return
+        try:
+            while True:
+                close_old_connections()
+                jobs = run_pending_jobs(limit=options["limit"])
+                for job in jobs:
+                    self.write_job(job)
+                if options["once"]:
+                    break
+                if not jobs:
+                    purge_finished_jobs(options["purge_after"])
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+
+    def write_job(self, job):
+        message = (
+            f"{job.name} #{job.pk}: {job.get_status_display()}, "
+            f"попытка {job.attempts}, {job.duration:.1f} мс"
+        )
+        if job.status == Job.DONE:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(message))
+
+    def write_stats(self):
+        for name, statuses in sorted(job_stats().items()):
+            self.stdout.write(name)
+            for status, row in sorted(statuses.items()):
+                avg = row["avg_ms"] or 0
+                peak = row["max_ms"] or 0
+                self.stdout.write(
+                    f"  {status}: {row['count']}, "
+                    f"среднее {avg:.1f} мс, максимум {peak:.1f} мс"
+                )
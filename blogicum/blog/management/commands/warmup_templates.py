@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.warmup import warm_up_templates
+
+
+class Command(BaseCommand):
+    help = "Загружает и компилирует все шаблоны проекта."
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        loaded, failed = warm_up_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        if failed:
+            raise CommandError(
+                "Шаблоны с ошибками: {}".format(", ".join(failed))
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено шаблонов: {loaded} за {elapsed:.1f} мс"
+            )
+        )
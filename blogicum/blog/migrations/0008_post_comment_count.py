@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:22
+
+from django.db import migrations, models
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    counts = (
+        Comment.objects.order_by()
+        .values("post_id")
+        .annotate(total=models.Count("id"))
+        .values_list("post_id", "total")
+    )
+    for post_id, total in counts.iterator():
+        Post.objects.filter(pk=post_id).update(comment_count=total)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0007_auto_20230529_1741"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="Количество комментариев",
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,111 @@
+import re
+
+from django.db import migrations
+
+# Копия схемы индекса и стеммера на момент миграции: миграция не должна
+# зависеть от будущих изменений blog.search и blog.models.
+SEARCH_TABLE = "blog_post_search"
+SEARCH_CONFIG = "russian"
+BATCH_SIZE = 1000
+
+WORD_RE = re.compile(r"\w+")
+RUSSIAN_WORD_RE = re.compile(r"[а-я]+")
+RUSSIAN_ENDINGS = sorted(
+    (
+        "иями ями ами иях ях ах ией ей ой ий ый ая яя ое ее ые ие ым им ом "
+        "ем ого его ому ему ыми ими ую юю ов ев ия ии ью ться тся ть ешь ишь "
+        "ете ите ет ит ут ют ат ят ла ло ли ал ял ил ыл а я о е ы и у ю ь й"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    word = word.lower().replace("ё", "е")
+    if not RUSSIAN_WORD_RE.fullmatch(word):
+        return word
+    for ending in RUSSIAN_ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[: -len(ending)]
+    return word
+
+
+def normalize(text):
+    return " ".join(stem(word) for word in WORD_RE.findall(text))
+
+
+def create_search_table(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                "USING fts5(title, text, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                "post_id bigint PRIMARY KEY REFERENCES blog_post (id) "
+                "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+                f"ON {SEARCH_TABLE} USING GIN (document)"
+            )
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    create_search_table(connection)
+    Post = apps.get_model("blog", "Post")
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (post_id, document) "
+            f"SELECT id, setweight(to_tsvector('{SEARCH_CONFIG}', title), "
+            f"'A') || setweight(to_tsvector('{SEARCH_CONFIG}', text), 'B') "
+            "FROM blog_post ON CONFLICT (post_id) DO NOTHING"
+        )
+    elif connection.vendor == "sqlite":
+        posts = (
+            Post.objects.using(connection.alias)
+            .order_by("pk")
+            .values_list("pk", "title", "text")
+        )
+        rows = []
+        with connection.cursor() as cursor:
+            for pk, title, text in posts.iterator(chunk_size=BATCH_SIZE):
+                rows.append((pk, normalize(title), normalize(text)))
+                if len(rows) == BATCH_SIZE:
+                    cursor.executemany(
+                        f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+                        "VALUES (%s, %s, %s)",
+                        rows,
+                    )
+                    rows = []
+            if rows:
+                cursor.executemany(
+                    f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+                    "VALUES (%s, %s, %s)",
+                    rows,
+                )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0011_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
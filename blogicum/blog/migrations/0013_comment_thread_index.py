@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-17 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0012_post_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created_at", "id"],
+                name="comment_thread_idx",
+            ),
+        ),
+    ]
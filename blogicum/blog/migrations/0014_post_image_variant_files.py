@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-17 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0013_comment_thread_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_variant_files",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,17 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.utils.functional import cached_property
 
-User = get_user_model()
-
+from .images import image_variant_urls
 
-class PostWithCommentsCountManager(models.Manager):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(comments_count=models.Count("comments"))
-        )
+User = get_user_model()
 
 
 class PublishedPostManager(models.Manager):
@@ -96,15 +90,76 @@ class Post(BaseModel):
         blank=True,
         verbose_name="Местоположение",
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
+    )
     objects = models.Manager()
     published_posts = PublishedPostManager()
 
     image = models.ImageField(upload_to="post_images/", blank=True)
+    image_variant_files = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-pub_date", "-id"],
+                condition=models.Q(is_published=True),
+                name="post_published_feed_idx",
+            ),
+            models.Index(
+                fields=["category", "-pub_date", "-id"],
+                condition=models.Q(is_published=True),
+                name="post_category_feed_idx",
+            ),
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="post_author_feed_idx",
+            ),
+        ]
 
     @property
     def image_exists(self):
         return bool(self.image)
 
+    @cached_property
+    def image_variants(self):
+        if not self.image:
+            return {}
+        return image_variant_urls(self.image, self.image_variant_files)
+
+    @property
+    def image_thumbnail_url(self):
+        return self._image_variant_url(0)
+
+    @property
+    def image_detail_url(self):
+        return self._image_variant_url(-1)
+
+    @property
+    def image_srcset(self):
+        return self._image_srcset("jpeg")
+
+    @property
+    def image_webp_srcset(self):
+        return self._image_srcset("webp")
+
+    def _image_variant_url(self, index):
+        variants = self.image_variants.get("jpeg")
+        if not variants:
+            return self.image.url
+        return variants[index][1]
+
+    def _image_srcset(self, image_format):
+        return ", ".join(
+            f"{url} {width}w"
+            for width, url in self.image_variants.get(image_format, [])
+        )
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -116,6 +171,62 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"],
+                name="comment_thread_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class Job(models.Model):
+    """Фоновая задача, которую выполняет команда `run_jobs`."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Выполнена"),
+        (FAILED, "Ошибка"),
+    ]
+
+    name = models.CharField(max_length=128, verbose_name="Задача")
+    payload = models.JSONField(default=dict, verbose_name="Параметры")
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Состояние",
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток")
+    max_attempts = models.PositiveIntegerField(
+        default=5, verbose_name="Максимум попыток"
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Запустить после"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Добавлено"
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(
+        null=True, blank=True, verbose_name="Длительность, мс"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Ошибка")
+
+    class Meta:
+        verbose_name = "фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,235 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import count_cache_key, get_cache
+from .publication import publication_aware_timeout
+from .routers import read_from_replica
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class WindowedPage(Page):
+    @property
+    def page_window(self):
+        """
+        Номера страниц вокруг текущей и по краям, с многоточиями
+        вместо остальных: шаблон выводит O(1) ссылок.
+        """
+        return self.paginator.get_elided_page_range(
+            self.number, on_each_side=2, on_ends=1
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор, который не считает COUNT(*) на каждый запрос.
+    Количество объектов хранится в кэше под версиями `count_scopes`
+    и сбрасывается при изменении публикаций; на больших таблицах
+    PostgreSQL вместо точного подсчёта берётся оценка планировщика.
+    """
+
+    def __init__(self, *args, count_scopes=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_scopes = count_scopes
+
+    @cached_property
+    def count(self):
+        if self.count_scopes is None:
+            return super().count
+        cache = get_cache()
+        key = count_cache_key(self.count_scopes)
+        count = cache.get(key)
+        if count is None:
+            # Значение кэшируется под текущей версией, поэтому
+            # считается по основной базе, а не по отстающей реплике.
+            with read_from_replica(False):
+                count = self.estimate_count()
+                if count is None:
+                    count = super().count
+            cache.set(
+                key,
+                count,
+                publication_aware_timeout(settings.BLOG_COUNT_CACHE_TIMEOUT),
+            )
+        return count
+
+    def estimate_count(self):
+        """
+        Возвращает оценку количества строк из плана запроса PostgreSQL,
+        если она не меньше `BLOG_COUNT_ESTIMATE_THRESHOLD`, иначе None.
+        """
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < settings.BLOG_COUNT_ESTIMATE_THRESHOLD:
+            return None
+        return estimate
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CursorPage(Sequence):
+    """
+    Страница ленты, построенная по курсору (keyset-пагинация).
+    Номера страниц и общее количество объектов не вычисляются.
+    """
+
+    is_cursor_page = True
+    number = None
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return "<Cursor page of %s objects>" % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу сортировки вместо OFFSET/LIMIT.
+    Стоимость получения любой страницы не зависит от её «глубины»,
+    а COUNT(*) по всей выборке не выполняется.
+    Курсор — непрозрачная строка, кодирующая направление перехода
+    и значения полей сортировки граничного объекта страницы.
+    """
+
+    NEXT = "n"
+    PREVIOUS = "p"
+
+    def __init__(self, object_list, per_page, ordering=("-pub_date", "-id")):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = [
+            self._get_model_field(name).value_to_string(obj)
+            for name in self.fields
+        ]
+        raw = json.dumps([direction, values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(cursor + padding).decode()
+            direction, values = json.loads(raw)
+            if direction not in (self.NEXT, self.PREVIOUS):
+                raise ValueError(direction)
+            if len(values) != len(self.fields):
+                raise ValueError(values)
+            values = [
+                self._get_model_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise InvalidCursor("Некорректный курсор страницы")
+        return direction, values
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._build_page(self._fetch(self.ordering), None, None)
+        direction, values = self.decode_cursor(cursor)
+        if direction == self.NEXT:
+            rows = self._fetch(self.ordering, values, reverse=False)
+            return self._build_page(rows, values, None)
+        rows = self._fetch(self._reversed_ordering(), values, reverse=True)
+        rows.reverse()
+        return self._build_page(rows, None, values)
+
+    def _build_page(self, rows, after, before):
+        """
+        Обрезает лишнюю запись, по которой определяется наличие
+        следующей (или предыдущей) страницы, и строит курсоры.
+        """
+        has_more = len(rows) > self.per_page
+        if before is None:
+            rows = rows[: self.per_page]
+            has_next, has_previous = has_more, after is not None
+        else:
+            rows = rows[-self.per_page:] if has_more else rows
+            has_next, has_previous = True, has_more
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], self.NEXT)
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], self.PREVIOUS)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def _fetch(self, ordering, values=None, reverse=False):
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, reverse))
+        return list(queryset[: self.per_page + 1])
+
+    def _seek_filter(self, values, reverse):
+        """
+        Условие «строго после ключа (v1, v2, ...)» в порядке сортировки:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        condition = Q()
+        equal = {}
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            descending = name.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+        return condition
+
+    def _reversed_ordering(self):
+        return tuple(
+            name[1:] if name.startswith("-") else f"-{name}"
+            for name in self.ordering
+        )
+
+    def _get_model_field(self, name):
+        model = self.object_list.model
+        if name == "pk":
+            return model._meta.pk
+        return model._meta.get_field(name)
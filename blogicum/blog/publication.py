@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+from .routers import read_from_replica
+
+HORIZON_CACHE_KEY = "blog:publication_horizon"
+NO_HORIZON = "none"
+
+
+def _get_cache():
+    return caches[settings.BLOG_CACHE_ALIAS]
+
+
+def next_publication_at():
+    """
+    Возвращает момент, когда станет видна ближайшая отложенная публикация,
+    или None, если отложенных публикаций нет.
+    Значение хранится в кэше до наступления этого момента,
+    до изменения публикаций и категорий, но не дольше
+    BLOG_HORIZON_CACHE_TIMEOUT.
+    """
+    cache = _get_cache()
+    now = timezone.now()
+    horizon = cache.get(HORIZON_CACHE_KEY)
+    if horizon == NO_HORIZON:
+        return None
+    if horizon is not None and horizon > now:
+        return horizon
+    # Значение хранится в общем кэше, поэтому читается из основной базы.
+    with read_from_replica(False):
+        horizon = Post.objects.filter(
+            pub_date__gt=now,
+            is_published=True,
+            category__is_published=True,
+        ).aggregate(horizon=Min("pub_date"))["horizon"]
+    cache.set(
+        HORIZON_CACHE_KEY,
+        horizon or NO_HORIZON,
+        settings.BLOG_HORIZON_CACHE_TIMEOUT,
+    )
+    return horizon
+
+
+def seconds_until_next_publication():
+    """
+    Возвращает количество секунд до ближайшей отложенной публикации
+    (округляя вверх) или None, если отложенных публикаций нет.
+    """
+    horizon = next_publication_at()
+    if horizon is None:
+        return None
+    return max(int((horizon - timezone.now()).total_seconds()) + 1, 1)
+
+
+def publication_aware_timeout(timeout):
+    """
+    Ограничивает время жизни кэша лент моментом ближайшей
+    отложенной публикации, чтобы она появилась вовремя.
+    """
+    seconds = seconds_until_next_publication()
+    if seconds is None:
+        return timeout
+    return min(timeout, seconds)
+
+
+def reset_publication_horizon():
+    _get_cache().delete(HORIZON_CACHE_KEY)
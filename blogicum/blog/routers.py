@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_APP_LABELS = {"blog"}
+PRIMARY_ONLY_MODELS = {"job"}
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads = ContextVar("blog_replica_reads", default=False)
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """
+    Разрешает читать данные блога с реплики внутри блока.
+    Вне блока все запросы идут в основную базу: так команды и фоновые
+    задачи не видят отставания реплики.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Направляет чтение моделей блога на реплику BLOG_REPLICA_ALIAS,
+    если это разрешено для текущего запроса, а запись — в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = settings.BLOG_REPLICA_ALIAS
+        if (
+            alias is None
+            or not _replica_reads.get()
+            or model._meta.app_label not in REPLICA_APP_LABELS
+            or model._meta.model_name in PRIMARY_ONLY_MODELS
+        ):
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.BLOG_REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaReadMiddleware:
+    """
+    Разрешает чтение с реплики для безопасных запросов. Запросы на
+    изменение и все запросы клиента в течение BLOG_PRIMARY_PIN_SECONDS
+    после изменения идут в основную базу, чтобы пользователь сразу
+    видел результат своих действий, несмотря на отставание реплики.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.BLOG_REPLICA_ALIAS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def uses_replica(self, request):
+        return (
+            request.method in SAFE_METHODS
+            and settings.BLOG_PRIMARY_PIN_COOKIE not in request.COOKIES
+        )
+
+    def process(self, request, response):
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.BLOG_PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.BLOG_PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        with read_from_replica(self.uses_replica(request)):
+            response = self.get_response(request)
+        return self.process(request, response)
+
+    async def __acall__(self, request):
+        with read_from_replica(self.uses_replica(request)):
+            response = await self.get_response(request)
+        return self.process(request, response)
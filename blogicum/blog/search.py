@@ -0,0 +1,267 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+
+from .models import Post
+
+SEARCH_TABLE = "blog_post_search"
+SEARCH_CONFIG = "russian"
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+WORD_RE = re.compile(r"\w+")
+RUSSIAN_WORD_RE = re.compile(r"[а-я]+")
+# Окончания и суффиксы, которые отбрасывает упрощённый стеммер.
+RUSSIAN_ENDINGS = sorted(
+    (
+        "иями ями ами иях ях ах ией ей ой ий ый ая яя ое ее ые ие ым им ом "
+        "ем ого его ому ему ыми ими ую юю ов ев ия ии ью ться тся ть ешь ишь "
+        "ете ите ет ит ут ют ат ят ла ло ли ал ял ил ыл а я о е ы и у ю ь й"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    """
+    Упрощённый стеммер русского языка: отбрасывает самое длинное
+    окончание, оставляя основу не короче MIN_STEM_LENGTH букв.
+    Слова не на кириллице только приводятся к нижнему регистру.
+    """
+    word = word.lower().replace("ё", "е")
+    if not RUSSIAN_WORD_RE.fullmatch(word):
+        return word
+    for ending in RUSSIAN_ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[: -len(ending)]
+    return word
+
+
+def normalize(text):
+    return " ".join(stem(word) for word in WORD_RE.findall(text))
+
+
+def get_connection():
+    # Индекс изменяется, поэтому работа идёт с базой для записи.
+    return connections[router.db_for_write(Post)]
+
+
+def create_search_table(connection):
+    """Создаёт таблицу полнотекстового индекса для текущей СУБД."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                "USING fts5(title, text, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                "post_id bigint PRIMARY KEY REFERENCES blog_post (id) "
+                "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+                f"ON {SEARCH_TABLE} USING GIN (document)"
+            )
+
+
+def drop_search_table(connection):
+    if connection.vendor in ("sqlite", "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def is_supported(connection=None):
+    connection = connection or get_connection()
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def remove_posts(post_ids, connection=None):
+    connection = connection or get_connection()
+    post_ids = list(post_ids)
+    if not post_ids or not is_supported(connection):
+        return
+    column = "rowid" if connection.vendor == "sqlite" else "post_id"
+    placeholders = ", ".join(["%s"] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE {column} IN ({placeholders})",
+            post_ids,
+        )
+
+
+def index_posts(post_ids, connection=None):
+    """
+    Обновляет индекс для указанных публикаций. Удалённые публикации
+    убираются из индекса. Видимость в индексе не учитывается:
+    она проверяется при поиске.
+    """
+    connection = connection or get_connection()
+    if not is_supported(connection):
+        return 0
+    post_ids = list(post_ids)
+    rows = list(
+        Post.objects.using(connection.alias)
+        .filter(pk__in=post_ids)
+        .values_list("pk", "title", "text")
+    )
+    if connection.vendor == "sqlite":
+        remove_posts(post_ids, connection)
+        sql = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+            "VALUES (%s, %s, %s)"
+        )
+        params = [
+            (pk, normalize(title), normalize(text)) for pk, title, text in rows
+        ]
+    else:
+        found = {pk for pk, _, _ in rows}
+        remove_posts(set(post_ids) - found, connection)
+        sql = (
+            f"INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'B')) "
+            "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document"
+        )
+        params = rows
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+    return len(rows)
+
+
+def rebuild_index(batch_size=1000, connection=None):
+    """Полностью перестраивает индекс. Возвращает число публикаций."""
+    connection = connection or get_connection()
+    if not is_supported(connection):
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    indexed = 0
+    last_pk = 0
+    pks = (
+        Post.objects.using(connection.alias)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    while True:
+        batch = list(pks.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return indexed
+        indexed += index_posts(batch, connection)
+        last_pk = batch[-1]
+
+
+def match_expression(query):
+    """Запрос FTS5: все основы слов запроса, с поиском по префиксу."""
+    return " ".join(f'"{stem(word)}"*' for word in WORD_RE.findall(query))
+
+
+class SearchResults:
+    """
+    Результаты поиска, упорядоченные по релевантности.
+    Поддерживает count() и срезы, поэтому подходит для Paginator.
+    Видимость публикаций проверяется коррелированным подзапросом
+    к `queryset`, так что поиск учитывает правила менеджера.
+    """
+
+    model = Post
+
+    def __init__(self, query, queryset=None):
+        self.query = query.strip()
+        self.queryset = (
+            queryset if queryset is not None else Post.published_posts.all()
+        )
+        self.connection = connections[self.queryset.db]
+
+    def __len__(self):
+        return self.count()
+
+    @cached_property
+    def _count(self):
+        if not WORD_RE.search(self.query):
+            return 0
+        if not is_supported(self.connection):
+            return self._fallback().count()
+        sql, params = self._search_sql("COUNT(*)")
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+    def count(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[slice(key, key + 1)][0]
+        start = key.start or 0
+        stop = key.stop if key.stop is not None else self.count()
+        if stop <= start or not WORD_RE.search(self.query):
+            return []
+        if not is_supported(self.connection):
+            return list(self._fallback()[start:stop])
+        sql, params = self._search_sql(self._id_column(), ordered=True)
+        sql += " LIMIT %s OFFSET %s"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [*params, stop - start, start])
+            post_ids = [row[0] for row in cursor.fetchall()]
+        posts = self.queryset.in_bulk(post_ids)
+        return [posts[pk] for pk in post_ids if pk in posts]
+
+    def _id_column(self):
+        if self.connection.vendor == "sqlite":
+            return f"{SEARCH_TABLE}.rowid"
+        return f"{SEARCH_TABLE}.post_id"
+
+    def _visible_sql(self):
+        visible = (
+            self.queryset.order_by()
+            .filter(pk=RawSQL(self._id_column(), ()))
+            .values("pk")
+        )
+        return visible.query.sql_with_params()
+
+    def _search_sql(self, columns, ordered=False):
+        visible_sql, visible_params = self._visible_sql()
+        if self.connection.vendor == "sqlite":
+            sql = (
+                f"SELECT {columns} FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s "
+                f"AND EXISTS ({visible_sql})"
+            )
+            params = [match_expression(self.query), *visible_params]
+            if ordered:
+                sql += (
+                    f" ORDER BY bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, "
+                    f"{TEXT_WEIGHT}), {self._id_column()} DESC"
+                )
+            return sql, params
+        sql = (
+            f"SELECT {columns} FROM {SEARCH_TABLE}, "
+            f"websearch_to_tsquery('{SEARCH_CONFIG}', %s) query "
+            f"WHERE {SEARCH_TABLE}.document @@ query "
+            f"AND EXISTS ({visible_sql})"
+        )
+        params = [self.query, *visible_params]
+        if ordered:
+            sql += (
+                f" ORDER BY ts_rank({SEARCH_TABLE}.document, query) DESC, "
+                f"{self._id_column()} DESC"
+            )
+        return sql, params
+
+    def _fallback(self):
+        condition = Q()
+        for word in WORD_RE.findall(self.query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return self.queryset.filter(condition).order_by("-pub_date", "-id")
@@ -0,0 +1,188 @@
+from contextvars import ContextVar
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .cache import (
+    author_pk_cache_key,
+    bump_version,
+    get_cache,
+    invalidate_feeds,
+)
+from .models import Category, Comment, Location, Post, User
+from .publication import reset_publication_horizon
+from .search import remove_posts
+from .tasks import enqueue
+
+# Публикации, которые удаляются вместе с комментариями: счётчик и кэш
+# таких публикаций не обновляются отдельно для каждого комментария.
+_deleting_post_ids = ContextVar("blog_deleting_post_ids", default=frozenset())
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+
+
+@receiver(post_save, sender=Comment)
+def notify_about_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        enqueue("notify_post_author", comment_id=instance.pk)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleting_post(sender, instance, **kwargs):
+    _deleting_post_ids.set(_deleting_post_ids.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleting_post(sender, instance, **kwargs):
+    _deleting_post_ids.set(_deleting_post_ids.get() - {instance.pk})
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if instance.post_id in _deleting_post_ids.get():
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    instance._previous_category_id = None
+    instance._previous_image = None
+    if instance.pk and not raw:
+        previous = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list("category_id", "image")
+            .first()
+        )
+        if previous is not None:
+            (
+                instance._previous_category_id,
+                instance._previous_image,
+            ) = previous
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    reset_publication_horizon()
+    bump_version("post", instance.pk)
+    bump_version("author_feed", instance.author_id)
+    category_ids = {
+        instance.category_id,
+        getattr(instance, "_previous_category_id", None),
+    }
+    invalidate_feeds(
+        Category.objects.filter(pk__in=category_ids).values_list(
+            "slug", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Post)
+def generate_post_image_variants(sender, instance, raw=False, **kwargs):
+    if raw or not instance.image:
+        return
+    if instance.image.name == getattr(instance, "_previous_image", None):
+        return
+    enqueue(
+        "generate_post_image_variants",
+        post_id=instance.pk,
+        name=instance.image.name,
+    )
+
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    if raw or (
+        update_fields is not None
+        and not {"title", "text"} & set(update_fields)
+    ):
+        return
+    enqueue("update_search_index", post_ids=[instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search(sender, instance, **kwargs):
+    remove_posts([instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post(sender, instance, **kwargs):
+    if instance.post_id in _deleting_post_ids.get():
+        # Кэш сбросит сигнал удаления самой публикации.
+        return
+    bump_version("post", instance.post_id)
+    invalidate_feeds(
+        Category.objects.filter(post__pk=instance.post_id).values_list(
+            "slug", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    reset_publication_horizon()
+    bump_version("category", instance.pk)
+    bump_version("site", "taxonomy")
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    bump_version("location", instance.pk)
+    bump_version("site", "taxonomy")
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_username = None
+    if update_fields is not None and "username" not in update_fields:
+        return
+    if instance.pk and not raw:
+        instance._previous_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    # Имя могло перейти к другому пользователю, поэтому сохранённый
+    # для лент первичный ключ сбрасывается и при создании.
+    usernames = {
+        instance.username,
+        getattr(instance, "_previous_username", None),
+    }
+    get_cache().delete_many(
+        [author_pk_cache_key(username) for username in usernames if username]
+    )
+    if created or (
+        update_fields is not None and set(update_fields) == {"last_login"}
+    ):
+        return
+    bump_version("author", instance.pk)
+    bump_version("site", "taxonomy")
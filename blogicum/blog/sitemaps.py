@@ -0,0 +1,225 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, IntegerField, Max, Sum
+from django.db.models.expressions import ExpressionWrapper
+from django.urls import reverse
+
+from .cache import get_versions
+from .models import Category, Post, User
+from .utils import absolute_url
+
+# Ограничение протокола sitemaps на количество адресов в одном файле.
+SHARD_SIZE = 50_000
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+INDEX_NAME = "sitemap.xml"
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 2000
+
+
+class ShardedSitemap:
+    """
+    Раздел карты сайта. Записи делятся на файлы по диапазонам
+    первичных ключей, поэтому изменения в одном диапазоне
+    не затрагивают остальные файлы.
+    """
+
+    name = None
+    fields = ()
+    lastmod_fields = ()
+    # Версии кэша, которые меняются при правках, не видных по ключам
+    # и датам (например, при смене slug или имени пользователя).
+    version_scopes = ()
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def location(self, row):
+        raise NotImplementedError
+
+    def lastmod(self, row):
+        return None
+
+    def filename(self, shard):
+        return f"sitemap-{self.name}-{shard + 1}.xml"
+
+    def fingerprints(self):
+        """
+        Отпечатки всех файлов раздела одним запросом. Новая, скрытая
+        или изменённая запись меняет количество, сумму ключей
+        или максимальную дату в своём диапазоне, а остальные правки —
+        версии из `version_scopes`.
+        """
+        versions = get_versions(*self.version_scopes)
+        shard = ExpressionWrapper(
+            (F("pk") - 1) / SHARD_SIZE, output_field=IntegerField()
+        )
+        aggregates = {
+            f"max_{field}": Max(field) for field in self.lastmod_fields
+        }
+        rows = (
+            self.get_queryset()
+            .order_by()
+            .annotate(shard=shard)
+            .values("shard")
+            .annotate(count=Count("pk"), checksum=Sum("pk"), **aggregates)
+            .order_by("shard")
+        )
+        fingerprints = {}
+        for row in rows:
+            dates = [
+                row[f"max_{field}"]
+                for field in self.lastmod_fields
+                if row[f"max_{field}"] is not None
+            ]
+            fingerprints[row["shard"]] = {
+                "fingerprint": [
+                    *versions,
+                    row["count"],
+                    row["checksum"],
+                    *[date.isoformat() for date in dates],
+                ],
+                "lastmod": max(dates).isoformat() if dates else None,
+            }
+        return fingerprints
+
+    def iter_urls(self, shard):
+        rows = (
+            self.get_queryset()
+            .filter(
+                pk__gt=shard * SHARD_SIZE, pk__lte=(shard + 1) * SHARD_SIZE
+            )
+            .order_by("pk")
+            .values_list(*self.fields)
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for row in rows:
+            yield self.location(row), self.lastmod(row)
+
+
+class PostSitemap(ShardedSitemap):
+    name = "posts"
+    fields = ("pk", "pub_date", "updated_at")
+    lastmod_fields = ("pub_date", "updated_at")
+
+    def get_queryset(self):
+        return Post.published_posts.all()
+
+    def location(self, row):
+        return reverse("blog:post_detail", args=[row[0]])
+
+    def lastmod(self, row):
+        return max(row[1], row[2])
+
+
+class CategorySitemap(ShardedSitemap):
+    name = "categories"
+    fields = ("pk", "slug", "created_at")
+    lastmod_fields = ("created_at",)
+    version_scopes = (("site", "taxonomy"),)
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+    def location(self, row):
+        return reverse("blog:category_posts", args=[row[1]])
+
+
+class ProfileSitemap(ShardedSitemap):
+    name = "profiles"
+    fields = ("pk", "username")
+    lastmod_fields = ("date_joined",)
+    version_scopes = (("site", "taxonomy"),)
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True)
+
+    def location(self, row):
+        return reverse("blog:profile", args=[row[1]])
+
+
+SITEMAPS = (PostSitemap(), CategorySitemap(), ProfileSitemap())
+
+
+def _write_atomic(path, lines):
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.writelines(lines)
+    os.replace(temporary, path)
+
+
+def _urlset(urls):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for location, lastmod in urls:
+        yield f"<url><loc>{escape(absolute_url(location))}</loc>"
+        if lastmod is not None:
+            yield f"<lastmod>{lastmod.isoformat()}</lastmod>"
+        yield "</url>\n"
+    yield "</urlset>\n"
+
+
+def _index(manifest):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for filename, entry in sorted(manifest.items()):
+        location = absolute_url(reverse("blog:sitemap", args=[filename]))
+        yield f"<sitemap><loc>{escape(location)}</loc>"
+        if entry["lastmod"] is not None:
+            yield f"<lastmod>{entry['lastmod']}</lastmod>"
+        yield "</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def load_manifest(directory):
+    try:
+        return json.loads(
+            (directory / MANIFEST_NAME).read_text(encoding="utf-8")
+        )
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def generate_sitemaps(force=False, directory=None):
+    """
+    Обновляет файлы карты сайта в BLOG_SITEMAP_DIR. Переписываются
+    только файлы, у которых изменился отпечаток, и индекс.
+    Возвращает счётчик записанных, неизменных и удалённых файлов.
+    """
+    directory = Path(directory or settings.BLOG_SITEMAP_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(directory)
+    manifest = {}
+    stats = Counter()
+    for sitemap in SITEMAPS:
+        for shard, entry in sitemap.fingerprints().items():
+            filename = sitemap.filename(shard)
+            manifest[filename] = entry
+            if (
+                not force
+                and previous.get(filename) == entry
+                and (directory / filename).exists()
+            ):
+                stats["unchanged"] += 1
+                continue
+            _write_atomic(
+                directory / filename, _urlset(sitemap.iter_urls(shard))
+            )
+            stats["written"] += 1
+    for filename in set(previous) - set(manifest):
+        (directory / filename).unlink(missing_ok=True)
+        stats["removed"] += 1
+    if (
+        stats["written"]
+        or stats["removed"]
+        or not (directory / INDEX_NAME).exists()
+    ):
+        _write_atomic(directory / INDEX_NAME, _index(manifest))
+        _write_atomic(
+            directory / MANIFEST_NAME, [json.dumps(manifest, indent=2)]
+        )
+    return stats
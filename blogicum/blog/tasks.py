@@ -0,0 +1,220 @@
+import logging
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .images import generate_image_variants
+from .models import Comment, Job, Post
+from .search import index_posts
+from .utils import absolute_url
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+@dataclass
+class Task:
+    name: str
+    func: Callable
+    max_attempts: int
+
+
+def task(name=None, max_attempts=5):
+    """Регистрирует функцию как фоновую задачу."""
+
+    def decorator(func):
+        task_name = name or func.__name__
+        TASKS[task_name] = Task(task_name, func, max_attempts)
+        return func
+
+    return decorator
+
+
+def enqueue(task_name, delay=0, **payload):
+    """
+    Ставит задачу в очередь в текущей транзакции: обработчик увидит
+    задачу только вместе с изменениями, которые её породили.
+    При BLOG_TASKS_EAGER задача выполняется сразу после фиксации.
+    """
+    job = Job.objects.create(
+        name=task_name,
+        payload=payload,
+        max_attempts=TASKS[task_name].max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    if settings.BLOG_TASKS_EAGER:
+        transaction.on_commit(lambda: run_next_job(job_id=job.pk))
+    return job
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной попыткой."""
+    return min(
+        settings.BLOG_TASK_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.BLOG_TASK_MAX_RETRY_DELAY,
+    )
+
+
+def claim_job(job_id=None):
+    """
+    Забирает одну готовую к запуску задачу. Задача захватывается
+    условным UPDATE, поэтому два обработчика не возьмут её дважды.
+    Задачи, которые «выполняются» дольше BLOG_TASK_TIMEOUT,
+    считаются потерянными и запускаются снова.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.BLOG_TASK_TIMEOUT)
+    candidates = Job.objects.filter(
+        Q(status=Job.PENDING, run_at__lte=now)
+        | Q(status=Job.RUNNING, started_at__lt=stale)
+    )
+    if job_id is not None:
+        candidates = candidates.filter(pk=job_id)
+    candidates = candidates.order_by("run_at", "pk").values_list(
+        "pk", "status", "started_at"
+    )
+    for pk, status, started_at in candidates[:10]:
+        claimed = Job.objects.filter(
+            pk=pk, status=status, started_at=started_at
+        ).update(
+            status=Job.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Выполняет захваченную задачу и записывает результат и время."""
+    started = time.perf_counter()
+    try:
+        TASKS[job.name].func(**job.payload)
+    except Exception as error:
+        job.last_error = "".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        )
+        if job.attempts >= job.max_attempts or job.name not in TASKS:
+            job.status = Job.FAILED
+            logger.error("Задача %s не выполнена: %s", job, error)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(
+                seconds=retry_delay(job.attempts)
+            )
+            logger.warning("Задача %s будет повторена: %s", job, error)
+    else:
+        job.status = Job.DONE
+        job.last_error = ""
+    job.finished_at = timezone.now()
+    job.duration = (time.perf_counter() - started) * 1000
+    job.save(
+        update_fields=[
+            "status",
+            "run_at",
+            "finished_at",
+            "duration",
+            "last_error",
+        ]
+    )
+    return job
+
+
+def run_next_job(job_id=None):
+    job = claim_job(job_id)
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def run_pending_jobs(limit=None):
+    """Выполняет готовые задачи, пока они есть. Возвращает их список."""
+    jobs = []
+    while limit is None or len(jobs) < limit:
+        job = run_next_job()
+        if job is None:
+            break
+        jobs.append(job)
+    return jobs
+
+
+def purge_finished_jobs(older_than):
+    """Удаляет выполненные задачи старше `older_than` секунд."""
+    border = timezone.now() - timedelta(seconds=older_than)
+    deleted, _ = Job.objects.filter(
+        status=Job.DONE, finished_at__lt=border
+    ).delete()
+    return deleted
+
+
+def job_stats():
+    """Количество задач по состояниям и время выполнения по именам."""
+    rows = (
+        Job.objects.order_by()
+        .values("name", "status")
+        .annotate(
+            count=Count("pk"),
+            avg_duration=Avg("duration"),
+            max_duration=Max("duration"),
+        )
+    )
+    stats = {}
+    for row in rows:
+        name_stats = stats.setdefault(row["name"], {})
+        name_stats[row["status"]] = {
+            "count": row["count"],
+            "avg_ms": row["avg_duration"],
+            "max_ms": row["max_duration"],
+        }
+    return stats
+
+
+@task(max_attempts=3)
+def generate_post_image_variants(post_id, name):
+    variants = generate_image_variants(name)
+    post = Post.objects.filter(pk=post_id, image=name).first()
+    if post is not None:
+        # Сигнал сохранения сбросит кэш карточки и лент публикации.
+        post.image_variant_files = variants
+        post.save(update_fields=["image_variant_files", "updated_at"])
+
+
+@task()
+def update_search_index(post_ids):
+    index_posts(post_ids)
+
+
+@task()
+def notify_post_author(comment_id):
+    comment = (
+        Comment.objects.select_related("author", "post__author")
+        .filter(pk=comment_id)
+        .first()
+    )
+    if comment is None:
+        return
+    post = comment.post
+    if not post.author.email or post.author_id == comment.author_id:
+        return
+    send_mail(
+        subject=f"Новый комментарий к публикации «{post.title}»",
+        message=(
+            f"{comment.author.username} прокомментировал "
+            f"вашу публикацию:\n\n{comment.text}\n\n"
+            f"{absolute_url(reverse('blog:post_detail', args=[post.pk]))}"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[post.author.email],
+        fail_silently=False,
+    )
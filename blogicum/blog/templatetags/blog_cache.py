@@ -0,0 +1,10 @@
+from django import template
+
+from blog.cache import render_post_card
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    return render_post_card(post)
@@ -2,11 +2,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path
 
-from . import views
+from . import async_views, feeds, views
 from .views import (
     CategoryView,
     IndexView,
     ProfileView,
+    SearchView,
     EditProfileView,
     PostDeleteView,
     CommentCreateView,
@@ -16,13 +17,51 @@ from .views import (
 
 app_name = "blog"
 
+if settings.BLOG_ASYNC_VIEWS:
+    index = async_views.index
+    post_detail = async_views.post_detail
+    category_posts = async_views.category_posts
+    profile = async_views.profile
+else:
+    index = IndexView.as_view()
+    post_detail = views.post_detail
+    category_posts = CategoryView.as_view()
+    profile = ProfileView.as_view()
+
 urlpatterns = [
-    path("", IndexView.as_view(), name="index"),
-    path("posts/<int:pk>/", views.post_detail, name="post_detail"),
+    path("", index, name="index"),
+    path("feed/", feeds.LatestPostsFeed(), name="feed"),
+    path("feed/atom/", feeds.LatestPostsAtomFeed(), name="feed_atom"),
+    path("posts/<int:pk>/", post_detail, name="post_detail"),
+    path(
+        "posts/<int:pk>/comments/", views.comment_list, name="comment_list"
+    ),
+    path("category/<slug:slug>/", category_posts, name="category_posts"),
+    path(
+        "category/<slug:slug>/feed/",
+        feeds.CategoryPostsFeed(),
+        name="category_feed",
+    ),
+    path(
+        "category/<slug:slug>/feed/atom/",
+        feeds.CategoryPostsAtomFeed(),
+        name="category_feed_atom",
+    ),
+    path("search/", SearchView.as_view(), name="search"),
+    path("export/<slug:name>/", views.export, name="export"),
+    path("sitemap.xml", views.sitemap, name="sitemap_index"),
+    path("sitemaps/<str:filename>", views.sitemap, name="sitemap"),
+    path("profile/<str:username>/", profile, name="profile"),
+    path(
+        "profile/<str:username>/feed/",
+        feeds.AuthorPostsFeed(),
+        name="author_feed",
+    ),
     path(
-        "category/<slug:slug>/", CategoryView.as_view(), name="category_posts"
+        "profile/<str:username>/feed/atom/",
+        feeds.AuthorPostsAtomFeed(),
+        name="author_feed_atom",
     ),
-    path("profile/<str:username>/", ProfileView.as_view(), name="profile"),
     path(
         "profile/<str:username>/edit/",
         EditProfileView.as_view(),
@@ -1,6 +1,10 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import Post
+from .models import Comment, Post
 
 
 def get_posts_for_year(year):
@@ -22,3 +26,52 @@ def get_days_until_publication(post):
         delta = post.pub_date - now
         return delta
     return 0
+
+
+def recount_comment_counts(
+    post_ids=None, batch_size=1000, using=DEFAULT_DB_ALIAS
+):
+    """
+    Пересчитывает денормализованный счётчик комментариев у постов
+    пачками по `batch_size` и исправляет расхождения.
+    Каждая пачка исправляется одним UPDATE с подзапросом, поэтому
+    комментарий, добавленный во время пересчёта, не теряется.
+    Возвращает пару (проверено постов, исправлено постов).
+    """
+    posts = Post.objects.using(using).order_by("pk")
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    actual = Coalesce(
+        Subquery(
+            Comment.objects.using(using)
+            .filter(post_id=OuterRef("pk"))
+            .order_by()
+            .values("post_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        ),
+        0,
+    )
+    checked = repaired = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not batch:
+            return checked, repaired
+        last_pk = batch[-1]
+        repaired += (
+            Post.objects.using(using)
+            .filter(pk__in=batch)
+            .exclude(comment_count=actual)
+            .update(comment_count=actual)
+        )
+        checked += len(batch)
+
+
+def absolute_url(path):
+    """Полный адрес страницы сайта для писем и карты сайта."""
+    return settings.BLOG_SITE_URL.rstrip("/") + path
@@ -1,17 +1,84 @@
+import json
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count, Q
+from django.core.paginator import InvalidPage
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max, Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from django.views import View
+from django.views.decorators.http import condition
 from django.views.generic import ListView, CreateView, UpdateView
+from django.views.static import serve
 
+from .cache import cache_anonymous_page, changed_at, get_versions
+from .export import EXPORT_FORMATS, EXPORTS, iter_export
 from .forms import PostForm, CommentForm
 from .models import Category, Post, Comment, User
+from .paginators import CachedCountPaginator, CursorPaginator
+from .search import SearchResults
+from .sitemaps import INDEX_NAME
 
 
 POSTS_ON_INDEX_PAGE = 10
+COMMENTS_ON_PAGE = 50
+
+
+class CachedCountPaginationMixin:
+    """
+    Подключает пагинатор с кэшированным количеством объектов.
+    Наследники возвращают версии кэша счётчика из `get_count_scopes`.
+    """
+
+    paginator_class = CachedCountPaginator
+
+    def get_count_scopes(self):
+        return None
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args, count_scopes=self.get_count_scopes(), **kwargs
+        )
+
+
+class CursorPaginationMixin(CachedCountPaginationMixin):
+    """
+    Позволяет ListView отдавать ленту по курсору вместо номера страницы.
+    Режим включается атрибутом `cursor_pagination`
+    или наличием параметра `cursor` в запросе.
+    """
+
+    cursor_pagination = False
+    cursor_kwarg = "cursor"
+    cursor_ordering = ("-pub_date", "-id")
+
+    def uses_cursor_pagination(self):
+        return (
+            self.cursor_pagination or self.cursor_kwarg in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset, page_size, ordering=self.cursor_ordering
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 @login_required
@@ -29,7 +96,7 @@ def post_create(request):
     return render(request, "blog/create.html", {"form": form})
 
 
-class ProfileView(ListView):
+class ProfileView(CursorPaginationMixin, ListView):
     template_name = "blog/profile.html"
     context_object_name = "posts"
     paginate_by = POSTS_ON_INDEX_PAGE
@@ -41,7 +108,14 @@ class ProfileView(ListView):
             User,
             username=self.kwargs.get(self.slug_url_kwarg),
         )
-        return Post.objects.filter(author=self.user).order_by("-pub_date")
+        return (
+            Post.objects.filter(author=self.user)
+            .select_related("category", "author", "location")
+            .order_by("-pub_date", "-id")
+        )
+
+    def get_count_scopes(self):
+        return [("author_feed", self.user.pk)]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -67,20 +141,46 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
         )
 
 
-class IndexView(ListView):
+class SearchView(CachedCountPaginationMixin, ListView):
+    template_name = "blog/search.html"
+    context_object_name = "posts"
+    paginate_by = POSTS_ON_INDEX_PAGE
+    query_kwarg = "q"
+
+    def get_queryset(self):
+        self.query = self.request.GET.get(self.query_kwarg, "").strip()
+        return SearchResults(self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        if self.query:
+            context["page_query"] = (
+                urlencode({self.query_kwarg: self.query}) + "&"
+            )
+        return context
+
+
+@method_decorator(
+    cache_anonymous_page(lambda: [("feed", "index")]), name="dispatch"
+)
+class IndexView(CursorPaginationMixin, ListView):
     template_name = "blog/index.html"
-    context_object_name = "page_obj"
+    context_object_name = "posts"
     paginate_by = POSTS_ON_INDEX_PAGE
 
     def get_queryset(self):
-        return (
-            Post.published_posts.all()
-            .annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
-        )
+        return Post.published_posts.all().order_by("-pub_date", "-id")
 
+    def get_count_scopes(self):
+        return [("feed", "index")]
 
-class CategoryView(ListView):
+
+@method_decorator(
+    cache_anonymous_page(lambda slug: [("category_feed", slug)]),
+    name="dispatch",
+)
+class CategoryView(CursorPaginationMixin, ListView):
     template_name = "blog/category.html"
     context_object_name = "posts"
     paginate_by = POSTS_ON_INDEX_PAGE
@@ -93,30 +193,98 @@ class CategoryView(ListView):
             is_published=True,
         )
         return Post.published_posts.filter(category=self.category).order_by(
-            "-pub_date"
+            "-pub_date", "-id"
         )
 
+    def get_count_scopes(self):
+        return [("category_feed", self.category.slug)]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["category"] = self.category
         return context
 
 
-def post_detail(request, pk):
+def get_visible_post(request, pk):
     if request.user.is_authenticated:
         posts = Post.objects.filter(
             Q(is_published=True)
             | (Q(author=request.user) & Q(is_published=False))
-        ).annotate(comment_count=Count("comments"))
+        ).select_related("category", "author", "location")
     else:
-        posts = Post.published_posts.all().annotate(
-            comment_count=Count("comments")
+        posts = Post.published_posts.all()
+    return get_object_or_404(posts, pk=pk)
+
+
+def get_comments_page(post, cursor):
+    paginator = CursorPaginator(
+        post.comments.select_related("author"),
+        COMMENTS_ON_PAGE,
+        ordering=("created_at", "id"),
+    )
+    try:
+        return paginator.page(cursor)
+    except InvalidPage as e:
+        raise Http404(str(e))
+
+
+def get_post_state(request, pk):
+    """
+    Всё, от чего зависит страница публикации для анонимного
+    пользователя, одним лёгким запросом без рендеринга и комментариев.
+    Результат запоминается в запросе: его используют и ETag,
+    и Last-Modified. Для авторизованных пользователей возвращает None.
+    """
+    if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+        return None
+    if not hasattr(request, "_post_state"):
+        request._post_state = (
+            Post.published_posts.filter(pk=pk)
+            .values(
+                "updated_at",
+                "pub_date",
+                "comment_count",
+                "author__username",
+                "category__title",
+                "category__slug",
+                "location__name",
+                "location__is_published",
+            )
+            .annotate(last_comment_at=Max("comments__created_at"))
+            .first()
         )
+    return request._post_state
+
+
+def post_detail_etag(request, pk):
+    state = get_post_state(request, pk)
+    if state is None:
+        return None
+    if not hasattr(request, "_post_etag"):
+        versions = get_versions(("site", "taxonomy"), ("post", pk))
+        payload = json.dumps(state, cls=DjangoJSONEncoder, sort_keys=True)
+        request._post_etag = md5(
+            "".join([payload, *versions]).encode()
+        ).hexdigest()
+    return request._post_etag
 
-    post = get_object_or_404(posts, pk=pk)
+
+def post_detail_last_modified(request, pk):
+    etag = post_detail_etag(request, pk)
+    if etag is None:
+        return None
+    return changed_at(f"post:{pk}", etag)
+
+
+@condition(
+    etag_func=post_detail_etag, last_modified_func=post_detail_last_modified
+)
+@cache_anonymous_page(lambda pk: [("post", pk)])
+def post_detail(request, pk):
+    post = get_visible_post(request, pk)
 
     form = CommentForm()
-    comments = post.comments.all()
+    comments = get_comments_page(post, request.GET.get("comments"))
 
     context = {
         "post": post,
@@ -126,10 +294,35 @@ def post_detail(request, pk):
     return render(request, "blog/detail.html", context)
 
 
+@cache_anonymous_page(lambda pk: [("post", pk)])
+def comment_list(request, pk):
+    post = get_visible_post(request, pk)
+    comments = get_comments_page(post, request.GET.get("after"))
+    html = render_to_string(
+        "includes/comment_list.html",
+        {"post": post, "comments": comments, "user": request.user},
+    )
+    return JsonResponse(
+        {
+            "comments": [
+                {
+                    "id": comment.id,
+                    "author": comment.author.username,
+                    "text": comment.text,
+                    "created_at": comment.created_at.isoformat(),
+                }
+                for comment in comments
+            ],
+            "html": html,
+            "next": comments.next_cursor,
+        }
+    )
+
+
 @login_required
 def post_edit(request, pk):
     post = get_object_or_404(Post, pk=pk)
-    if request.user != post.author:
+    if request.user.pk != post.author_id:
         return redirect("blog:post_detail", pk=post.pk)
 
     if request.method == "POST":
@@ -149,13 +342,14 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post_id = self.kwargs["post_id"]
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse_lazy("blog:post_detail", args=[self.object.post.id])
+        return reverse_lazy("blog:post_detail", args=[self.object.post_id])
 
 
 class CommentUpdateView(UserPassesTestMixin, UpdateView):
@@ -163,16 +357,22 @@ class CommentUpdateView(UserPassesTestMixin, UpdateView):
     form_class = CommentForm
     template_name = "blog/comment.html"
 
+    def get_object(self, queryset=None):
+        # Комментарий нужен и проверке прав, и самому представлению.
+        if not hasattr(self, "_object"):
+            self._object = super().get_object(queryset)
+        return self._object
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
     def test_func(self):
         comment = self.get_object()
-        return self.request.user == comment.author
+        return self.request.user.pk == comment.author_id
 
     def get_success_url(self):
-        return reverse_lazy("blog:post_detail", args=[self.object.post.id])
+        return reverse_lazy("blog:post_detail", args=[self.object.post_id])
 
 
 class BaseDeleteView(UserPassesTestMixin, View):
@@ -181,11 +381,15 @@ class BaseDeleteView(UserPassesTestMixin, View):
     success_url_name = None
 
     def get_object(self, **kwargs):
-        return get_object_or_404(self.model, pk=self.kwargs[self.key_name])
+        if not hasattr(self, "_object"):
+            self._object = get_object_or_404(
+                self.model, pk=self.kwargs[self.key_name]
+            )
+        return self._object
 
     def test_func(self):
         object = self.get_object()
-        return self.request.user == object.author
+        return self.request.user.pk == object.author_id
 
     def get(self, request, *args, **kwargs):
         object = self.get_object()
@@ -193,6 +397,7 @@ class BaseDeleteView(UserPassesTestMixin, View):
             request, self.template_name, {self.model.__name__.lower(): object}
         )
 
+    @transaction.atomic
     def post(self, request, *args, **kwargs):
         object = self.get_object()
         object.delete()
@@ -203,9 +408,10 @@ class BaseDeleteView(UserPassesTestMixin, View):
 
     def delete(self, request, *args, **kwargs):
         object = self.get_object()
-        if request.user != object.author:
+        if request.user.pk != object.author_id:
             raise PermissionDenied
-        object.delete()
+        with transaction.atomic():
+            object.delete()
         success_url = self.get_success_url(object)
         return redirect(success_url)
 
@@ -220,7 +426,8 @@ class PostDeleteView(BaseDeleteView):
         return redirect(
             reverse(
                 self.success_url_name,
-                kwargs={"username": object.author.username},
+                # Удалять публикацию может только её автор.
+                kwargs={"username": self.request.user.username},
             )
         )
 
@@ -233,5 +440,38 @@ class CommentDeleteView(BaseDeleteView):
 
     def get_success_url(self, object):
         return redirect(
-            reverse(self.success_url_name, kwargs={"pk": object.post.pk})
+            reverse(self.success_url_name, kwargs={"pk": object.post_id})
         )
+
+
+@staff_member_required
+def export(request, name):
+    """
+    Потоковая выгрузка для аналитики: строки читаются из базы пачками
+    и сразу отправляются клиенту. Читает с реплики, если она есть.
+    """
+    export_format = request.GET.get("format", "ndjson")
+    if name not in EXPORTS or export_format not in EXPORT_FORMATS:
+        raise Http404
+    content_type, extension = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        iter_export(
+            name,
+            export_format,
+            using=settings.BLOG_REPLICA_ALIAS or DEFAULT_DB_ALIAS,
+        ),
+        content_type=content_type,
+    )
+    filename = f"{name}-{timezone.now():%Y%m%d}.{extension}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def sitemap(request, filename=INDEX_NAME):
+    """
+    Отдаёт файлы карты сайта, созданные командой `generate_sitemaps`,
+    с Last-Modified и ответом 304 на повторный запрос.
+    """
+    if not filename.startswith("sitemap") or not filename.endswith(".xml"):
+        raise Http404
+    return serve(request, filename, document_root=settings.BLOG_SITEMAP_DIR)
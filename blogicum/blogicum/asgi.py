@@ -5,3 +5,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
 
 application = get_asgi_application()
+
+# Модуль прогрева импортируется после настройки окружения и django.setup().
+from blogicum.warmup import warm_up  # noqa: E402
+
+warm_up()
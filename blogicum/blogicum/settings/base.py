@@ -0,0 +1,276 @@
+"""
+Общие настройки проекта. Параметры, которые отличаются между
+окружениями, читаются из переменных окружения; значения по умолчанию
+подходят для локальной разработки.
+"""
+from pathlib import Path
+
+from .env import env, env_bool, env_int, env_list
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = env(
+    "DJANGO_SECRET_KEY",
+    "django-insecure-g)j3ic9=zew$%xn7b3yx@*5t1uy+2)*u_jhmr-*72@_i(q1mv8",
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = env_bool("DJANGO_DEBUG", False)
+
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", ["localhost", "127.0.0.1"])
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "blog.apps.BlogConfig",
+    "pages.apps.PagesConfig",
+    "django_bootstrap5",
+]
+
+MIDDLEWARE = [
+    "blog.instrumentation.QueryInstrumentationMiddleware",
+    "blog.routers.ReplicaReadMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "blogicum.urls"
+
+TEMPLATES_DIR = BASE_DIR / "templates"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [TEMPLATES_DIR],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "blogicum.wsgi.application"
+
+# Database
+# https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+
+DATABASES = {
+    "default": {
+        "ENGINE": env("DJANGO_DB_ENGINE", "django.db.backends.sqlite3"),
+        "NAME": env("DJANGO_DB_NAME", str(BASE_DIR / "db.sqlite3")),
+        "USER": env("DJANGO_DB_USER", ""),
+        "PASSWORD": env("DJANGO_DB_PASSWORD", ""),
+        "HOST": env("DJANGO_DB_HOST", ""),
+        "PORT": env("DJANGO_DB_PORT", ""),
+        "CONN_MAX_AGE": env_int("DJANGO_DB_CONN_MAX_AGE", 0),
+    }
+}
+
+# Реплика для чтения. Для локальной проверки достаточно второго файла
+# SQLite: DJANGO_DB_REPLICA_NAME=db_replica.sqlite3, затем
+# `migrate --database=replica` и копирование данных.
+if env("DJANGO_DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": env("DJANGO_DB_REPLICA_NAME"),
+        "HOST": env("DJANGO_DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": env("DJANGO_DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        # В тестах реплика совпадает с основной базой.
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["blog.routers.PrimaryReplicaRouter"]
+
+# Псевдоним реплики или None, если реплики нет.
+BLOG_REPLICA_ALIAS = "replica" if "replica" in DATABASES else None
+# Сколько секунд после изменения запросы клиента идут в основную базу.
+BLOG_PRIMARY_PIN_SECONDS = env_int("BLOG_PRIMARY_PIN_SECONDS", 5)
+BLOG_PRIMARY_PIN_COOKIE = "blog_primary"
+
+# Проверка постоянных соединений перед запросом (см. blog.connections):
+# в Django 3.2 нет собственной настройки CONN_HEALTH_CHECKS.
+BLOG_DB_HEALTH_CHECKS = env_bool("BLOG_DB_HEALTH_CHECKS", False)
+
+# Password validation
+# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+# Internationalization
+# https://docs.djangoproject.com/en/3.2/topics/i18n/
+
+LANGUAGE_CODE = "ru-RU"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/3.2/howto/static-files/
+
+STATIC_URL = "/static/"
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+STATIC_ROOT = env("DJANGO_STATIC_ROOT", str(BASE_DIR / "staticfiles"))
+STATICFILES_STORAGE = env(
+    "DJANGO_STATICFILES_STORAGE",
+    "django.contrib.staticfiles.storage.StaticFilesStorage",
+)
+MEDIA_URL = "/media/"
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+MEDIA_ROOT = BASE_DIR / "media"
+
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+
+LOGIN_REDIRECT_URL = "blog:index"
+
+LOGIN_URL = "login"
+
+CSRF_FAILURE_VIEW = "pages.views.csrf_failure"
+
+CACHES = {
+    "default": {
+        "BACKEND": env(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": env("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+LOG_LEVEL = env("DJANGO_LOG_LEVEL", "INFO")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {
+            "format": "{asctime} {levelname} {name}: {message}",
+            "style": "{",
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "plain",
+        },
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": "WARNING",
+    },
+    "loggers": {
+        "blog": {"level": LOG_LEVEL},
+        "blogicum": {"level": LOG_LEVEL},
+        "pages": {"level": LOG_LEVEL},
+        "django.db.backends": {
+            "level": env("DJANGO_DB_LOG_LEVEL", "WARNING"),
+        },
+    },
+}
+
+BLOG_CACHE_ALIAS = "default"
+
+BLOG_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+BLOG_PAGE_CACHE_ALIAS = "default"
+
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Горизонт публикаций сбрасывают сигналы, но изменения в обход ORM
+# (миграции, правки в базе) подхватываются не позже этого срока.
+BLOG_HORIZON_CACHE_TIMEOUT = 60 * 10
+
+BLOG_QUERY_INSTRUMENTATION = env_bool("BLOG_QUERY_INSTRUMENTATION", True)
+
+BLOG_QUERY_BUDGETS = {
+    "blog:index": 5,
+    "blog:category_posts": 6,
+    "blog:profile": 6,
+    "blog:post_detail": 4,
+    "blog:comment_list": 4,
+    "blog:post_create": 4,
+    "blog:edit_post": 5,
+    "blog:edit_profile": 2,
+    "blog:add_comment": 8,
+    "blog:edit_comment": 5,
+    "blog:delete_comment": 8,
+    "blog:delete_post": 11,
+    "pages:about": 2,
+    "pages:rules": 2,
+}
+
+BLOG_COUNT_CACHE_TIMEOUT = 60 * 60
+
+BLOG_COUNT_ESTIMATE_THRESHOLD = 100_000
+
+# Фоновые задачи выполняет команда `run_jobs`. При разработке
+# и в тестах обработчик не запускается (BLOG_TASKS_WORKER не задан),
+# и задачи выполняются сразу после фиксации транзакции в процессе,
+# который их поставил. В продакшене по умолчанию нужен обработчик.
+BLOG_TASKS_WORKER = env_bool("BLOG_TASKS_WORKER", False)
+
+BLOG_TASKS_EAGER = env_bool("BLOG_TASKS_EAGER", not BLOG_TASKS_WORKER)
+
+BLOG_TASK_RETRY_DELAY = 30
+
+BLOG_TASK_MAX_RETRY_DELAY = 60 * 60
+
+BLOG_TASK_TIMEOUT = 60 * 10
+
+BLOG_ASYNC_VIEWS = env_bool("BLOG_ASYNC_VIEWS", False)
+
+PAGES_PRERENDER_DIR = BASE_DIR / "prerendered"
+
+# Каталог с файлами карты сайта и адрес сайта для ссылок в них.
+BLOG_SITEMAP_DIR = BASE_DIR / "sitemaps"
+
+BLOG_SITE_URL = env("BLOG_SITE_URL", "http://localhost:8000")
+
+TEMPLATE_WARMUP = env_bool("DJANGO_TEMPLATE_WARMUP", False)
@@ -0,0 +1,9 @@
+"""Настройки для локальной разработки и тестов."""
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES
+from .env import env_bool, with_cached_loaders
+
+DEBUG = env_bool("DJANGO_DEBUG", True)
+
+if env_bool("DJANGO_TEMPLATE_CACHE", False):
+    TEMPLATES = with_cached_loaders(TEMPLATES)
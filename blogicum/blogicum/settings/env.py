@@ -0,0 +1,76 @@
+"""Чтение настроек из переменных окружения."""
+import os
+from copy import deepcopy
+
+from django.core.exceptions import ImproperlyConfigured
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off", ""}
+
+
+def env(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_required(name):
+    value = os.environ.get(name)
+    if not value:
+        raise ImproperlyConfigured(f"Переменная окружения {name} не задана")
+    return value
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ImproperlyConfigured(
+        f"{name} должна быть логическим значением, получено {value!r}"
+    )
+
+
+def env_int(name, default=None):
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(
+            f"{name} должна быть целым числом, получено {value!r}"
+        )
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def with_cached_loaders(templates):
+    """
+    Возвращает копию TEMPLATES, в которой шаблоны загружаются
+    кэширующим загрузчиком: чтение и разбор один раз на процесс.
+    """
+    templates = deepcopy(templates)
+    for backend in templates:
+        options = backend.setdefault("OPTIONS", {})
+        if (
+            backend["BACKEND"]
+            != "django.template.backends.django.DjangoTemplates"
+            or "loaders" in options
+        ):
+            continue
+        loaders = ["django.template.loaders.filesystem.Loader"]
+        if backend.pop("APP_DIRS", False):
+            loaders.append("django.template.loaders.app_directories.Loader")
+        backend["APP_DIRS"] = False
+        options["loaders"] = [
+            ("django.template.loaders.cached.Loader", loaders),
+        ]
+    return templates
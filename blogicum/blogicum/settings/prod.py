@@ -0,0 +1,66 @@
+"""
+Настройки для продакшена:
+DJANGO_SETTINGS_MODULE=blogicum.settings.prod.
+"""
+from copy import deepcopy
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, TEMPLATES
+from .env import env, env_bool, env_int, env_required, with_cached_loaders
+
+# Ключ из репозитория в продакшене не используется.
+SECRET_KEY = env_required("DJANGO_SECRET_KEY")
+
+DEBUG = env_bool("DJANGO_DEBUG", False)
+
+# Копии, чтобы изменения не затронули словари из base.
+DATABASES = deepcopy(DATABASES)
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = env_int("DJANGO_DB_CONN_MAX_AGE", 60)
+
+BLOG_DB_HEALTH_CHECKS = env_bool("BLOG_DB_HEALTH_CHECKS", True)
+
+# Версии кэша меняют и веб-процессы, и `run_jobs`, и команды управления,
+# поэтому кэш должен быть общим для всех процессов.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+CACHES = {
+    "default": {
+        "BACKEND": env_required("DJANGO_CACHE_BACKEND"),
+        "LOCATION": env("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+if CACHES["default"]["BACKEND"] in PROCESS_LOCAL_CACHES:
+    raise ImproperlyConfigured(
+        "В продакшене задайте общий кэш в DJANGO_CACHE_BACKEND "
+        "и DJANGO_CACHE_LOCATION (Redis, Memcached или база данных)."
+    )
+
+# Шаблоны читаются с диска и компилируются один раз на процесс.
+TEMPLATES = deepcopy(TEMPLATES)
+if env_bool("DJANGO_TEMPLATE_CACHE", True):
+    TEMPLATES = with_cached_loaders(TEMPLATES)
+TEMPLATES[0]["OPTIONS"]["context_processors"] = [
+    processor
+    for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+    if processor != "django.template.context_processors.debug"
+]
+
+STATICFILES_STORAGE = env(
+    "DJANGO_STATICFILES_STORAGE",
+    "django.contrib.staticfiles.storage.ManifestStaticFilesStorage",
+)
+
+BLOG_QUERY_INSTRUMENTATION = env_bool("BLOG_QUERY_INSTRUMENTATION", False)
+
+# Письма, изображения и поисковый индекс обрабатывает `run_jobs`,
+# а не поток запроса. Немедленное выполнение остаётся для разработки.
+BLOG_TASKS_WORKER = env_bool("BLOG_TASKS_WORKER", True)
+
+BLOG_TASKS_EAGER = env_bool("BLOG_TASKS_EAGER", False)
+
+TEMPLATE_WARMUP = env_bool("DJANGO_TEMPLATE_WARMUP", True)
@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
 
 application = get_wsgi_application()
+
+# Модуль прогрева импортируется после настройки окружения и django.setup().
+from blogicum.warmup import warm_up  # noqa: E402
+
+warm_up()
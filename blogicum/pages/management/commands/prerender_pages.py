@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from pages.prerender import PRERENDERED_PAGES, prerender_page
+
+
+class Command(BaseCommand):
+    help = (
+        "Заранее рендерит статические страницы для анонимных "
+        "пользователей. Запускается при каждом деплое."
+    )
+
+    def handle(self, *args, **options):
+        for view_name in PRERENDERED_PAGES:
+            if prerender_page(view_name):
+                message = self.style.SUCCESS(f"{view_name}: обновлена")
+            else:
+                message = f"{view_name}: без изменений"
+            self.stdout.write(message)
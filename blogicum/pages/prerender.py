@@ -0,0 +1,95 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+PRERENDERED_PAGES = ("pages:about", "pages:rules")
+
+_loaded = {}
+
+
+@dataclass
+class PrerenderedPage:
+    content: bytes
+    content_type: str
+    etag: str
+    last_modified: float
+
+
+def _paths(view_name):
+    directory = Path(settings.PAGES_PRERENDER_DIR)
+    name = view_name.replace(":", "-")
+    return directory / f"{name}.html", directory / f"{name}.json"
+
+
+def render_anonymous(view_name):
+    """
+    Рендерит страницу так, как её видит анонимный пользователь.
+    Сохранённый ранее файл при этом не используется, иначе изменения
+    шаблонов никогда не попали бы в новую версию страницы.
+    """
+    path = reverse(view_name)
+    request = RequestFactory().get(path, SERVER_NAME=settings.ALLOWED_HOSTS[0])
+    request.user = AnonymousUser()
+    request.prerendering = True
+    match = resolve(path)
+    request.resolver_match = match
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response.content, response["Content-Type"]
+
+
+def prerender_page(view_name):
+    """
+    Сохраняет HTML страницы и её метаданные. Если содержимое
+    не изменилось, ETag и Last-Modified остаются прежними,
+    и браузеры продолжают получать 304.
+    Возвращает True, если файл страницы обновлён.
+    """
+    content, content_type = render_anonymous(view_name)
+    etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+    html_path, meta_path = _paths(view_name)
+    previous = load_page(view_name)
+    if previous is not None and previous.etag == etag:
+        return False
+    html_path.parent.mkdir(parents=True, exist_ok=True)
+    html_path.write_bytes(content)
+    page = PrerenderedPage(
+        content=content,
+        content_type=content_type,
+        etag=etag,
+        last_modified=timezone.now().timestamp(),
+    )
+    meta = asdict(page)
+    del meta["content"]
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return True
+
+
+def load_page(view_name):
+    """
+    Возвращает сохранённую страницу или None. Файлы читаются заново
+    только после их изменения командой `prerender_pages`.
+    """
+    html_path, meta_path = _paths(view_name)
+    try:
+        mtime = meta_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(view_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        page = PrerenderedPage(content=html_path.read_bytes(), **meta)
+    except (OSError, ValueError, TypeError):
+        return None
+    _loaded[view_name] = (mtime, page)
+    return page
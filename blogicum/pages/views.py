@@ -1,12 +1,47 @@
-from django.views import generic
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views import generic
 
-
-class AboutView(generic.TemplateView):
+from .prerender import load_page
+
+
+class PrerenderedPageMixin:
+    """
+    Отдаёт анонимным пользователям страницу, заранее созданную командой
+    `prerender_pages`, и отвечает 304 на условные запросы.
+    Авторизованным пользователям, при отсутствии файла и при самом
+    создании файла страница рендерится как обычно.
+    """
+
+    def get(self, request, *args, **kwargs):
+        page = None
+        if not request.user.is_authenticated and not getattr(
+            request, "prerendering", False
+        ):
+            page = load_page(request.resolver_match.view_name)
+        if page is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(
+            request,
+            etag=page.etag,
+            last_modified=int(page.last_modified),
+        )
+        if response is None:
+            response = HttpResponse(
+                page.content, content_type=page.content_type
+            )
+        response["ETag"] = quote_etag(page.etag)
+        response["Last-Modified"] = http_date(page.last_modified)
+        return response
+
+
+class AboutView(PrerenderedPageMixin, generic.TemplateView):
     template_name = "pages/about.html"
 
 
-class RulesView(generic.TemplateView):
+class RulesView(PrerenderedPageMixin, generic.TemplateView):
     template_name = "pages/rules.html"
 
 
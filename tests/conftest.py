@@ -81,6 +81,13 @@ def mixer():
     return _mixer
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
+
+
 @pytest.fixture
 def user(mixer):
     User = get_user_model()
@@ -333,8 +340,7 @@ def cleanup(request):
 
     for root, dirs, files in os.walk(image_dir):
         for filename in files:
-            if (filename.endswith('.jpg') or filename.endswith(
-                    '.gif') or filename.endswith('.png')):
+            if filename.endswith(('.jpg', '.gif', '.png', '.webp')):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
                     os.remove(file_path)
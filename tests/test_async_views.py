@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncClient, AsyncRequestFactory, Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _get(view, path, **kwargs):
+    request = AsyncRequestFactory().get(path)
+    request.user = AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+def test_async_views_render_pages(post_with_published_location):
+    from blog import async_views
+
+    post = post_with_published_location
+    pages = [
+        (async_views.index, '/', {}),
+        (async_views.category_posts, f'/category/{post.category.slug}/',
+         {'slug': post.category.slug}),
+        (async_views.profile, f'/profile/{post.author.username}/',
+         {'username': post.author.username}),
+        (async_views.post_detail, f'/posts/{post.id}/', {'pk': post.id}),
+    ]
+    for view, path, kwargs in pages:
+        assert asyncio.iscoroutinefunction(view)
+        response = _get(view, path, **kwargs)
+        assert response.status_code == 200
+        assert post.title in response.content.decode('utf-8'), (
+            f'Убедитесь, что асинхронная версия страницы {path} '
+            'выводит публикации.'
+        )
+
+
+def test_async_view_serves_cached_page_without_queries(
+        client: Client, post_with_published_location,
+        django_assert_num_queries):
+    from blog import async_views
+
+    expected = client.get('/').content
+    with django_assert_num_queries(0):
+        response = _get(async_views.index, '/')
+    assert response.content == expected, (
+        'Убедитесь, что асинхронный view отдаёт анонимному пользователю '
+        'страницу из кэша без обращения к базе данных.'
+    )
+
+
+def test_async_post_detail_sends_validators(
+        client: Client, post_with_published_location):
+    from blog import async_views
+
+    post = post_with_published_location
+    client.get(f'/posts/{post.id}/')
+    response = _get(async_views.post_detail, f'/posts/{post.id}/', pk=post.id)
+    assert response.status_code == 200
+    assert 'ETag' in response and 'Last-Modified' in response, (
+        'Убедитесь, что асинхронная страница публикации из кэша '
+        'отдаётся с ETag и Last-Modified.'
+    )
+
+
+def test_instrumentation_counts_queries_under_asgi(
+        post_with_published_location):
+    from blog.instrumentation import get_view_stats, reset_view_stats
+
+    post = post_with_published_location
+    reset_view_stats()
+    response = async_to_sync(AsyncClient().get)(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    stats = get_view_stats()['blog:post_detail']
+    assert stats.last_queries > 0, (
+        'Убедитесь, что под ASGI middleware считает SQL-запросы view.'
+    )
+    assert 'queries' in response['Server-Timing']
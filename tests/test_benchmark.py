@@ -0,0 +1,49 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_benchmark_command(tmp_path):
+    output = tmp_path / 'bench.json'
+    call_command(
+        'benchmark', generate=True, users=3, categories=2, locations=2,
+        posts=30, comments=60, seed=1, requests=2, warmup=0,
+        output=str(output), stderr=StringIO())
+
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['generated']['posts'] == 30
+    measured = {(r['client'], r['view_name']) for r in report['results']}
+    for view_name in ('blog:index', 'blog:post_detail',
+                      'blog:category_posts', 'blog:profile',
+                      'pages:about', 'pages:rules'):
+        assert ('anonymous', view_name) in measured, (
+            f'Убедитесь, что команда `benchmark` замеряет {view_name}.')
+        assert ('author', view_name) in measured
+    for result in report['results']:
+        assert {'p50', 'p90', 'p99'} <= set(result['latency_ms'])
+        assert 'max' in result['queries']
+
+
+def test_benchmark_throughput(tmp_path):
+    output = tmp_path / 'bench.json'
+    call_command(
+        'benchmark', generate=True, users=2, categories=1, locations=1,
+        posts=5, comments=5, seed=1, requests=2, warmup=0,
+        throughput=True, concurrency=1,
+        output=str(output), stderr=StringIO())
+
+    report = json.loads(output.read_text(encoding='utf-8'))
+    interfaces = {r['interface']: r for r in report['throughput']}
+    assert set(interfaces) == {'wsgi', 'asgi'}, (
+        'Убедитесь, что команда `benchmark --throughput` сравнивает '
+        'WSGI и ASGI.'
+    )
+    for result in interfaces.values():
+        assert result['status_codes'] == [200]
+        assert result['rps'] > 0
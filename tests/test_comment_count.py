@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_comment_count_follows_comment_views(
+        user_client: Client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при создании комментария увеличивается '
+        'счётчик комментариев публикации.'
+    )
+
+    comment = post.comments.get()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        'счётчик комментариев публикации.'
+    )
+
+
+def test_comment_count_follows_bulk_delete(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+    post.comments.all().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        'Убедитесь, что счётчик комментариев обновляется '
+        'при массовом удалении комментариев.'
+    )
+
+
+def test_recount_comments_repairs_drift(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command('recount_comments', batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что команда `recount_comments` исправляет '
+        'расхождения счётчика комментариев.'
+    )
+
+
+def test_recount_comments_updates_each_batch_in_one_statement(
+        mixer: Mixer, post_with_published_location):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from blog.utils import recount_comment_counts
+
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+
+    with CaptureQueriesContext(connection) as context:
+        assert recount_comment_counts(batch_size=10) == (1, 1)
+    writes = [
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith('SELECT')
+    ]
+    assert len(writes) == 1 and 'SELECT' in writes[0], (
+        'Убедитесь, что счётчик пачки исправляется одним UPDATE '
+        'с подзапросом, а не записью прочитанных ранее значений.'
+    )
+
+
+def test_comment_thread_is_paginated(
+        mixer: Mixer, user_client: Client, post_with_published_location):
+    from blog.views import COMMENTS_ON_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_ON_PAGE + 5).blend(
+        'blog.Comment', post=post)
+    response = user_client.get(f'/posts/{post.id}/')
+    first_page = response.context['comments']
+    assert len(first_page) == COMMENTS_ON_PAGE, (
+        'Убедитесь, что на странице публикации комментарии '
+        'выводятся постранично.'
+    )
+    response = user_client.get(
+        f'/posts/{post.id}/', {'comments': first_page.next_cursor})
+    assert [c.id for c in response.context['comments']] == [
+        c.id for c in comments[COMMENTS_ON_PAGE:]], (
+        'Убедитесь, что ссылка «Показать ещё комментарии» ведёт '
+        'к следующим комментариям.'
+    )
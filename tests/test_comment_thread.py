@@ -0,0 +1,41 @@
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_comment_list_endpoint(
+        mixer: Mixer, client: Client, post_with_published_location):
+    from blog.views import COMMENTS_ON_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_ON_PAGE * 2 + 1).blend(
+        'blog.Comment', post=post)
+    url = f'/posts/{post.id}/comments/'
+
+    seen = []
+    after = ''
+    while after is not None:
+        response = client.get(url, {'after': after})
+        assert response.status_code == 200, (
+            f'Убедитесь, что страница {url} загружается без ошибок.')
+        data = response.json()
+        assert len(data['comments']) <= COMMENTS_ON_PAGE
+        for item in data['comments']:
+            assert f'comment_{item["id"]}' in data['html']
+        seen.extend(item['id'] for item in data['comments'])
+        after = data['next']
+    assert seen == [comment.id for comment in comments], (
+        'Убедитесь, что по курсору `after` комментарии отдаются '
+        'постранично, по порядку и без повторов.'
+    )
+
+
+def test_comment_list_respects_post_visibility(
+        client: Client, user_client: Client, user, mixer: Mixer):
+    post = mixer.blend('blog.Post', author=user, is_published=False)
+    assert client.get(f'/posts/{post.id}/comments/').status_code == 404
+    assert user_client.get(f'/posts/{post.id}/comments/').status_code == 200
@@ -0,0 +1,99 @@
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_post_detail_conditional_get(
+        client: Client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert response['Last-Modified']
+
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        'Убедитесь, что неизменившаяся страница публикации отдаётся '
+        'анонимному пользователю с кодом 304 одним лёгким запросом.'
+    )
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('change', ['post', 'comment', 'category', 'location'])
+def test_post_detail_etag_changes(
+        client: Client, mixer: Mixer, post_with_published_location, change):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    etag = client.get(url)['ETag']
+    if change == 'post':
+        post.text = 'Новый текст'
+        post.save()
+    elif change == 'comment':
+        mixer.blend('blog.Comment', post=post)
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+    else:
+        post.location.is_published = False
+        post.location.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        f'Убедитесь, что ETag страницы публикации меняется '
+        f'при изменении: {change}.'
+    )
+    assert response['ETag'] != etag
+
+
+def test_post_detail_conditional_get_only_for_anonymous(
+        user_client: Client, client: Client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    etag = client.get(url)['ETag']
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert 'ETag' not in response
+
+
+@pytest.mark.parametrize(
+    'change',
+    ['post', 'comment', 'comment_delete', 'category', 'location', 'author'])
+def test_post_detail_if_modified_since_alone(
+        client: Client, mixer: Mixer, post_with_published_location, change):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    if change == 'comment_delete':
+        comment = mixer.blend('blog.Comment', post=post)
+    last_modified = client.get(url)['Last-Modified']
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    if change == 'post':
+        post.text = 'Новый текст'
+        post.save()
+    elif change == 'comment':
+        mixer.blend('blog.Comment', post=post)
+    elif change == 'comment_delete':
+        comment.delete()
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+    elif change == 'location':
+        post.location.name = 'Новое место'
+        post.location.save()
+    else:
+        post.author.username = 'renamed_author'
+        post.author.save()
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        'Убедитесь, что Last-Modified страницы публикации сдвигается '
+        f'при изменении: {change}.'
+    )
+    assert response['Last-Modified'] != last_modified
@@ -0,0 +1,61 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+
+
+@pytest.mark.django_db
+def test_health_check_closes_unusable_connection(monkeypatch, settings):
+    from blog.connections import check_connections
+
+    connection.ensure_connection()
+    closed = []
+    settings.BLOG_DB_HEALTH_CHECKS = True
+    monkeypatch.setattr(connection, 'in_atomic_block', False)
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    check_connections()
+    assert closed, (
+        'Убедитесь, что перед запросом непригодное постоянное '
+        'соединение с базой закрывается.'
+    )
+
+    closed.clear()
+    monkeypatch.setattr(connection, 'is_usable', lambda: True)
+    check_connections()
+    assert not closed
+
+
+@pytest.mark.django_db
+def test_connection_acquisition_is_timed():
+    from blog.instrumentation import QueryCounter, time_connects
+
+    fresh = connections.create_connection('default')
+    counter = QueryCounter()
+    try:
+        with time_connects(fresh, counter):
+            fresh.ensure_connection()
+            fresh.ensure_connection()
+        assert counter.connects == 1
+        assert counter.connect_time > 0
+        assert 'ensure_connection' not in fresh.__dict__
+    finally:
+        fresh.close()
+
+
+@pytest.mark.django_db
+def test_benchmark_compares_conn_max_age(tmp_path):
+    output = tmp_path / 'bench.json'
+    call_command(
+        'benchmark', generate=True, users=2, categories=1, locations=1,
+        posts=5, comments=5, seed=1, requests=2, warmup=0,
+        conn_max_age=60, output=str(output), stderr=StringIO())
+
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert {r['conn_max_age'] for r in report['connections']} == {0, 60}
+    for result in report['connections']:
+        assert result['status_codes'] == [200]
+        assert 'mean_connect_ms' in result['connections']
+    assert connection.settings_dict['CONN_MAX_AGE'] == 0
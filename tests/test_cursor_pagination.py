@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.test import Client
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    same_date = datetime.now(tz=pytz.UTC) - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=same_date)
+
+
+def _walk(client: Client, url: str, cursor_key: str):
+    seen = []
+    cursor = ''
+    for _ in range(10):
+        response = client.get(url, {'cursor': cursor})
+        assert response.status_code == 200, (
+            f'Убедитесь, что страница {url} с курсором загружается '
+            'без ошибок.')
+        page = response.context['page_obj']
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.id for post in page)
+        cursor = getattr(page, cursor_key)
+        if cursor is None:
+            return seen, page
+    raise AssertionError('Курсорная пагинация зациклилась.')
+
+
+def test_cursor_pagination_walks_whole_feed(
+        user_client: Client, feed_posts, user, published_category):
+    expected = sorted((post.id for post in feed_posts), reverse=True)
+    for url in ('/', f'/category/{published_category.slug}/',
+                f'/profile/{user.username}/'):
+        seen, last_page = _walk(user_client, url, 'next_cursor')
+        assert seen == expected, (
+            f'Убедитесь, что курсорная пагинация на странице {url} '
+            'возвращает все публикации ровно один раз и в порядке '
+            'от новых к старым.'
+        )
+        assert last_page.has_previous()
+
+        response = user_client.get(
+            url, {'cursor': last_page.previous_cursor})
+        previous_page = response.context['page_obj']
+        assert [post.id for post in previous_page] == (
+            expected[N_PER_PAGE:N_PER_PAGE * 2]), (
+            'Убедитесь, что ссылка «Новее» ведёт на предыдущую страницу.'
+        )
+
+
+def test_invalid_cursor_returns_404(user_client: Client, feed_posts):
+    response = user_client.get('/', {'cursor': 'not-a-cursor'})
+    assert response.status_code == 404
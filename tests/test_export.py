@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def exported_posts(mixer: Mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category)
+    mixer.blend('blog.Comment', post=posts[0], author=user, text='Первый')
+    return posts
+
+
+def test_export_command_ndjson(exported_posts, tmp_path):
+    output = tmp_path / 'posts.ndjson'
+    call_command(
+        'export_content', 'posts', output=str(output), chunk_size=2,
+        stderr=io.StringIO())
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row['id'] for row in rows] == [
+        post.pk for post in exported_posts
+    ], 'Убедитесь, что команда выгружает все публикации по порядку.'
+    assert rows[0]['comment_count'] == 1
+    assert rows[0]['author'] == exported_posts[0].author.username
+
+
+def test_export_command_csv(exported_posts, tmp_path):
+    output = tmp_path / 'comments.csv'
+    call_command(
+        'export_content', 'comments', format='csv', output=str(output),
+        stderr=io.StringIO())
+    with open(output, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 1
+    assert rows[0]['text'] == 'Первый'
+    assert rows[0]['post'] == str(exported_posts[0].pk)
+
+
+def test_export_endpoint_streams_for_staff(
+        exported_posts, user_client: Client, mixer: Mixer):
+    url = '/export/posts/?format=csv'
+    response = user_client.get(url)
+    assert response.status_code == 302, (
+        'Убедитесь, что выгрузка доступна только сотрудникам.'
+    )
+
+    staff = mixer.blend('auth.User', is_staff=True)
+    client = Client()
+    client.force_login(staff)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.streaming, (
+        'Убедитесь, что выгрузка передаётся потоком.'
+    )
+    content = b''.join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == len(exported_posts)
+    assert 'attachment' in response['Content-Disposition']
+    assert client.get('/export/users/').status_code == 404
@@ -0,0 +1,105 @@
+import pytest
+from django.test import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    visible = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Видимая публикация', is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1))
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Скрытая публикация', is_published=False)
+    return visible, hidden
+
+
+@pytest.mark.parametrize('url, content_type', [
+    ('/feed/', 'application/rss+xml'),
+    ('/feed/atom/', 'application/atom+xml'),
+])
+def test_site_feed(client: Client, feed_posts, url, content_type):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith(content_type)
+    content = response.content.decode()
+    assert 'Видимая публикация' in content
+    assert 'Скрытая публикация' not in content, (
+        'Убедитесь, что в ленту попадают только опубликованные записи.'
+    )
+
+
+def test_category_and_author_feeds(
+        client: Client, feed_posts, user, mixer: Mixer):
+    visible, _ = feed_posts
+    response = client.get(f'/category/{visible.category.slug}/feed/')
+    assert 'Видимая публикация' in response.content.decode()
+    response = client.get(f'/profile/{user.username}/feed/atom/')
+    assert 'Видимая публикация' in response.content.decode()
+
+    hidden_category = mixer.blend('blog.Category', is_published=False)
+    assert client.get(
+        f'/category/{hidden_category.slug}/feed/').status_code == 404
+    assert client.get('/profile/nobody/feed/').status_code == 404
+
+
+def test_feed_conditional_get(
+        client: Client, feed_posts, django_assert_num_queries):
+    response = client.get('/feed/')
+    etag = response['ETag']
+    assert response['Last-Modified']
+
+    with django_assert_num_queries(0):
+        response = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        'Убедитесь, что неизменившаяся лента отдаётся с кодом 304 '
+        'без обращения к базе данных.'
+    )
+
+    visible, _ = feed_posts
+    visible.title = 'Новый заголовок'
+    visible.save()
+    response = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что после изменения публикации лента обновляется.'
+    )
+    assert response['ETag'] != etag
+    assert 'Новый заголовок' in response.content.decode()
+
+
+def test_feed_last_modified_moves_when_post_is_hidden(
+        client: Client, feed_posts):
+    response = client.get('/feed/')
+    last_modified = response['Last-Modified']
+
+    visible, _ = feed_posts
+    visible.is_published = False
+    visible.save()
+    response = client.get('/feed/', HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        'Убедитесь, что скрытие публикации сдвигает Last-Modified ленты.'
+    )
+    assert 'Видимая публикация' not in response.content.decode()
+
+
+def test_author_feed_follows_renamed_user(
+        client: Client, feed_posts, user, mixer: Mixer):
+    old_username = user.username
+    assert client.get(f'/profile/{old_username}/feed/').status_code == 200
+
+    user.username = 'renamed'
+    user.save()
+    mixer.blend('auth.User', username=old_username)
+    response = client.get(f'/profile/{old_username}/feed/')
+    assert 'Видимая публикация' not in response.content.decode(), (
+        'Убедитесь, что после смены имени лента автора не отдаёт '
+        'публикации прежнего владельца имени.'
+    )
+    response = client.get('/profile/renamed/feed/')
+    assert 'Видимая публикация' in response.content.decode()
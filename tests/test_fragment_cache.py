@@ -0,0 +1,44 @@
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def _card_renders(response) -> int:
+    return [t.name for t in response.templates].count(POST_CARD_TEMPLATE)
+
+
+def test_post_card_is_cached(
+        user_client: Client, post_with_published_location):
+    assert _card_renders(user_client.get('/')) == 1
+    assert _card_renders(user_client.get('/')) == 0, (
+        'Убедитесь, что карточка публикации берётся из кэша '
+        'при повторном отображении ленты.'
+    )
+
+
+def test_post_card_invalidation(
+        mixer: Mixer, user_client: Client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    post.location.name = 'Новое название места'
+    post.location.save()
+    post.author.username = 'renamed_author'
+    post.author.save()
+    mixer.blend('blog.Comment', post=post)
+
+    content = user_client.get('/').content.decode('utf-8')
+    for expected in ('Новое название категории', 'Новое название места',
+                     '@renamed_author', 'Комментарии (1)'):
+        assert expected in content, (
+            'Убедитесь, что кэш карточки публикации сбрасывается '
+            'при изменении связанных с ней объектов.'
+        )
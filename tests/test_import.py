@@ -0,0 +1,140 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+RECORDS = [
+    {'model': 'blog.post', 'pk': 10, 'fields': {
+        'title': 'Обед', 'text': 'Обед у знакомых.', 'author': 7,
+        'category': 3, 'location': None, 'is_published': True,
+        'pub_date': '1897-02-13T00:00:00Z',
+        'created_at': '2022-12-18T23:06:18.993Z'}},
+    {'model': 'blog.comment', 'pk': 5, 'fields': {
+        'post': 10, 'author': ['importer'], 'text': 'Вкусно!',
+        'created_at': '2022-12-19T10:00:00Z'}},
+    {'model': 'blog.category', 'pk': 3, 'fields': {
+        'title': 'Дневник', 'slug': 'diary', 'description': 'Записи',
+        'is_published': True}},
+    {'model': 'admin.logentry', 'pk': 1, 'fields': {}},
+    {'model': 'auth.user', 'pk': 7, 'fields': {
+        'username': 'importer', 'password': '!', 'groups': []}},
+]
+
+
+def test_iter_records_streams_json_and_ndjson():
+    from blog.importer import ImportDataError, iter_records
+
+    array = json.dumps(RECORDS, ensure_ascii=False, indent=2)
+    ndjson = '\n'.join(json.dumps(record) for record in RECORDS)
+    for text in (array, ndjson):
+        records = list(iter_records(io.StringIO(text), read_size=16))
+        assert records == RECORDS, (
+            'Убедитесь, что записи читаются из JSON-массива и NDJSON '
+            'по частям.'
+        )
+    with pytest.raises(ImportDataError):
+        list(iter_records(io.StringIO(array[:-1]), read_size=16))
+
+
+def test_iter_records_fails_fast_on_broken_record():
+    from blog.importer import ImportDataError, iter_records
+
+    line = json.dumps(RECORDS[0]) + '\n'
+    stream = io.StringIO('{"model": broken}\n' + line * 10000)
+    with pytest.raises(ImportDataError):
+        list(iter_records(stream, read_size=64))
+    assert stream.tell() <= 64, (
+        'Убедитесь, что испорченная строка NDJSON обнаруживается '
+        'без чтения остального файла.'
+    )
+
+    stream = io.StringIO('[{"text": "' + 'x' * 100000 + ', ' + line * 100)
+    with pytest.raises(ImportDataError):
+        list(iter_records(stream, read_size=64, max_record_size=1024))
+    assert stream.tell() <= 4096, (
+        'Убедитесь, что запись JSON-массива не растёт в памяти '
+        'больше `max_record_size`.'
+    )
+
+
+def test_import_content(tmp_path):
+    from blog.models import Comment, Post
+    from blog.search import SearchResults
+
+    path = tmp_path / 'content.ndjson'
+    path.write_text(
+        '\n'.join(json.dumps(record) for record in RECORDS),
+        encoding='utf-8')
+    for _ in range(2):
+        output = io.StringIO()
+        call_command(
+            'import_content', str(path), batch_size=1, chunk_size=2,
+            stdout=output, stderr=io.StringIO())
+        assert 'записей/с' in output.getvalue()
+    assert 'blog.post: 1' not in output.getvalue(), (
+        'Убедитесь, что повторный импорт не считает уже существующие '
+        'записи импортированными.'
+    )
+    assert 'blog.post: пропущено 1' in output.getvalue(), (
+        'Убедитесь, что существующие записи учитываются как пропущенные.'
+    )
+
+    post = Post.objects.get()
+    assert post.author.username == 'importer'
+    assert post.category.slug == 'diary'
+    assert post.created_at.year == 2022, (
+        'Убедитесь, что импорт сохраняет даты создания из файла.'
+    )
+    assert Comment.objects.get().author_id == 7
+    assert post.comment_count == 1, (
+        'Убедитесь, что после импорта пересчитываются счётчики '
+        'комментариев.'
+    )
+    assert list(SearchResults('обед')[:10]) == [post], (
+        'Убедитесь, что импортированные публикации попадают '
+        'в поисковый индекс.'
+    )
+
+
+def test_import_skips_unresolved_references(tmp_path):
+    from blog.models import Post
+
+    path = tmp_path / 'content.json'
+    path.write_text(json.dumps(RECORDS[:1]), encoding='utf-8')
+    output = io.StringIO()
+    call_command('import_content', str(path), stdout=output)
+    assert not Post.objects.exists()
+    assert 'blog.post: пропущено 1' in output.getvalue()
+
+
+def test_import_resets_sequences(tmp_path, monkeypatch):
+    from django.db import connection
+
+    from blog.models import Post
+
+    reset_models = []
+    sequence_reset_sql = connection.ops.sequence_reset_sql
+
+    def record_reset(style, models):
+        reset_models.extend(models)
+        return sequence_reset_sql(style, models)
+
+    monkeypatch.setattr(
+        connection.ops, 'sequence_reset_sql', record_reset)
+    path = tmp_path / 'content.json'
+    path.write_text(json.dumps(RECORDS), encoding='utf-8')
+    call_command('import_content', str(path), stdout=io.StringIO())
+    assert Post in reset_models, (
+        'Убедитесь, что после импорта сбрасываются счётчики первичных '
+        'ключей, как в `loaddata`.'
+    )
+    post = Post.objects.get()
+    new_post = Post.objects.create(
+        title='Новая', text='Текст', author=post.author,
+        pub_date=post.pub_date)
+    assert new_post.pk != post.pk
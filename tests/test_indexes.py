@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category, published_location):
+    return mixer.cycle(N_PER_PAGE * 3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location)
+
+
+def _view_queryset(view_cls, rf, **kwargs):
+    view = view_cls()
+    view.setup(rf.get('/'), **kwargs)
+    return view.get_queryset()[:N_PER_PAGE]
+
+
+def _explain(queryset) -> str:
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    elif connection.vendor != 'sqlite':
+        pytest.skip('Проверка плана запроса есть только для SQLite '
+                    'и PostgreSQL.')
+    return queryset.explain()
+
+
+def test_feed_queries_use_indexes(rf, feed_posts, user, published_category):
+    from blog.views import CategoryView, IndexView, ProfileView
+
+    for queryset, index_name in (
+            (_view_queryset(IndexView, rf), 'post_published_feed_idx'),
+            (_view_queryset(CategoryView, rf, slug=published_category.slug),
+             'post_category_feed_idx'),
+            (_view_queryset(ProfileView, rf, username=user.username),
+             'post_author_feed_idx'),
+    ):
+        plan = _explain(queryset)
+        assert index_name in plan, (
+            f'Убедитесь, что запрос ленты использует индекс `{index_name}`. '
+            f'План запроса:\n{plan}'
+        )
@@ -0,0 +1,120 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def flaky_task():
+    from blog.tasks import TASKS, task
+
+    calls = []
+
+    @task(name='test_flaky', max_attempts=2)
+    def flaky(fail):
+        calls.append(fail)
+        if fail:
+            raise ValueError('Ошибка задачи')
+
+    yield calls
+    TASKS.pop('test_flaky')
+
+
+def test_job_retries_with_backoff_then_fails(flaky_task):
+    from blog.models import Job
+    from blog.tasks import enqueue, run_pending_jobs
+
+    job = enqueue('test_flaky', fail=True)
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.PENDING and job.attempts == 1, (
+        'Убедитесь, что упавшая задача возвращается в очередь.'
+    )
+    assert job.run_at > timezone.now(), (
+        'Убедитесь, что повтор задачи откладывается.'
+    )
+    assert 'ValueError' in job.last_error
+    assert run_pending_jobs() == []
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED and job.attempts == 2, (
+        'Убедитесь, что задача помечается ошибочной после '
+        'исчерпания попыток.'
+    )
+    assert flaky_task == [True, True]
+
+
+def test_job_is_claimed_once(flaky_task):
+    from blog.models import Job
+    from blog.tasks import claim_job, enqueue, run_job
+
+    enqueue('test_flaky', fail=False)
+    job = claim_job()
+    assert claim_job() is None, (
+        'Убедитесь, что выполняемая задача не выдаётся повторно.'
+    )
+    run_job(job)
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert job.duration is not None
+
+
+def test_comment_notification_is_queued(
+        another_user_client: Client, post_with_published_location,
+        mailoutbox, settings):
+    from blog.models import Job
+
+    settings.BLOG_SITE_URL = 'https://blogicum.test/'
+
+    post = post_with_published_location
+    post.author.email = 'author@example.com'
+    post.author.save()
+    another_user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    assert not mailoutbox, (
+        'Убедитесь, что письмо автору публикации отправляется '
+        'фоновой задачей, а не в обработчике запроса.'
+    )
+    assert Job.objects.filter(name='notify_post_author').exists()
+
+    call_command('run_jobs', once=True)
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ['author@example.com']
+    assert f'https://blogicum.test/posts/{post.id}/' in mailoutbox[0].body, (
+        'Убедитесь, что письмо содержит полную ссылку на публикацию.'
+    )
+    assert not Job.objects.exclude(status=Job.DONE).exists()
+
+
+def test_queue_without_worker_is_reported(settings):
+    from blog.checks import check_task_worker
+
+    settings.DEBUG = True
+    assert check_task_worker(None) == [], (
+        'Убедитесь, что без обработчика задачи по умолчанию '
+        'выполняются сразу.'
+    )
+    settings.BLOG_TASKS_EAGER = False
+    settings.BLOG_TASKS_WORKER = False
+    assert [error.id for error in check_task_worker(None)] == [
+        'blog.W001'
+    ], (
+        'Убедитесь, что очередь без обработчика выдаёт предупреждение '
+        'проверки системы.'
+    )
+    settings.BLOG_TASKS_EAGER = True
+    settings.DEBUG = False
+    assert [error.id for error in check_task_worker(None)] == [
+        'blog.W002'
+    ], (
+        'Убедитесь, что немедленное выполнение задач вне режима '
+        'разработки выдаёт предупреждение: повторов не будет.'
+    )
+    settings.BLOG_TASKS_WORKER = True
+    assert check_task_worker(None) == []
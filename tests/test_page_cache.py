@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _is_cache_hit(response) -> bool:
+    return response.status_code == 200 and not response.templates
+
+
+def test_anonymous_pages_are_cached(
+        client: Client, user_client: Client, post_with_published_location):
+    post = post_with_published_location
+    for url in ('/', f'/category/{post.category.slug}/',
+                f'/posts/{post.id}/'):
+        assert not _is_cache_hit(client.get(url))
+        assert _is_cache_hit(client.get(url)), (
+            f'Убедитесь, что страница {url} кэшируется '
+            'для анонимных пользователей.'
+        )
+        assert not _is_cache_hit(user_client.get(url)), (
+            f'Убедитесь, что страница {url} не берётся из кэша '
+            'для авторизованных пользователей.'
+        )
+
+
+def test_page_cache_invalidation(
+        mixer: Mixer, client: Client, post_with_published_location):
+    post = post_with_published_location
+    urls = ('/', f'/category/{post.category.slug}/', f'/posts/{post.id}/')
+    for url in urls:
+        client.get(url)
+
+    post.title = 'Обновлённый заголовок'
+    post.save()
+    for url in urls:
+        assert 'Обновлённый заголовок' in client.get(url).content.decode(), (
+            f'Убедитесь, что кэш страницы {url} сбрасывается '
+            'при изменении публикации.'
+        )
+
+    mixer.blend('blog.Comment', post=post, text='Новый комментарий')
+    assert 'Новый комментарий' in client.get(
+        f'/posts/{post.id}/').content.decode(), (
+        'Убедитесь, что кэш страницы публикации сбрасывается '
+        'при добавлении комментария.'
+    )
+
+
+def test_page_cache_expires_with_scheduled_post(
+        mixer: Mixer, client: Client, user, published_category):
+    from blog.cache import page_cache_timeout
+
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=timezone.now() + timedelta(seconds=30))
+    assert page_cache_timeout() <= 31, (
+        'Убедитесь, что кэш ленты истекает к моменту публикации '
+        'ближайшего отложенного поста.'
+    )
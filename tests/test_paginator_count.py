@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def many_pages_of_posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(N_PER_PAGE * 15).blend(
+        'blog.Post', author=user, category=published_category)
+
+
+def _count_queries(captured) -> int:
+    return sum('COUNT(' in query['sql'] for query in captured)
+
+
+def test_feed_count_is_cached(
+        mixer: Mixer, user_client: Client, user, published_category,
+        many_pages_of_posts):
+    urls = ('/', f'/category/{published_category.slug}/',
+            f'/profile/{user.username}/')
+    for url in urls:
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as captured:
+            response = user_client.get(url, {'page': 2})
+        assert _count_queries(captured) == 0, (
+            f'Убедитесь, что на странице {url} количество публикаций '
+            'берётся из кэша, а не считается на каждый запрос.'
+        )
+        assert response.context['page_obj'].paginator.count == len(
+            many_pages_of_posts)
+
+    mixer.blend('blog.Post', author=user, category=published_category)
+    for url in urls:
+        response = user_client.get(url)
+        assert response.context['page_obj'].paginator.count == len(
+            many_pages_of_posts) + 1, (
+            f'Убедитесь, что кэш количества публикаций на странице {url} '
+            'сбрасывается при добавлении публикации.'
+        )
+
+
+def test_page_range_is_windowed(user_client: Client, many_pages_of_posts):
+    response = user_client.get('/', {'page': 8})
+    page = response.context['page_obj']
+    window = list(page.page_window)
+    assert page.paginator.ELLIPSIS in window
+    assert len(window) < page.paginator.num_pages, (
+        'Убедитесь, что пагинатор выводит ограниченное количество ссылок '
+        'на страницы.'
+    )
+    assert 8 in window
@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def prerendered(settings, tmp_path):
+    settings.PAGES_PRERENDER_DIR = tmp_path
+    call_command('prerender_pages')
+    return tmp_path
+
+
+@pytest.mark.parametrize('url', ['/pages/about/', '/pages/rules/'])
+def test_prerendered_page_conditional_get(
+        client: Client, prerendered, url, django_assert_num_queries):
+    first = client.get(url)
+    assert 'ETag' in first
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == first.content
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert response.status_code == 304, (
+        'Убедитесь, что заранее созданная страница отвечает 304 '
+        'на запрос с совпадающим ETag.'
+    )
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+    assert response.status_code == 304
+
+
+def test_prerender_keeps_validators_for_same_content(prerendered):
+    from pages.prerender import load_page
+
+    etag = load_page('pages:about').etag
+    last_modified = load_page('pages:about').last_modified
+    call_command('prerender_pages')
+    page = load_page('pages:about')
+    assert (page.etag, page.last_modified) == (etag, last_modified)
+
+
+def test_prerender_picks_up_template_changes(prerendered, monkeypatch):
+    from pages.prerender import _paths, load_page
+    from pages.views import AboutView
+
+    etag = load_page('pages:about').etag
+    html_path, _ = _paths('pages:about')
+    html_path.write_bytes(b'STALE')
+    monkeypatch.setattr(AboutView, 'template_name', 'pages/rules.html')
+    call_command('prerender_pages')
+    page = load_page('pages:about')
+    assert page.content != b'STALE', (
+        'Убедитесь, что `prerender_pages` рендерит страницу заново, '
+        'а не читает собственный сохранённый файл.'
+    )
+    assert page.etag != etag, (
+        'Убедитесь, что изменение шаблона меняет ETag страницы.'
+    )
+
+
+def test_logged_in_user_gets_dynamic_page(
+        user_client: Client, user, prerendered):
+    response = user_client.get('/pages/about/')
+    assert 'ETag' not in response
+    assert user.username in response.content.decode('utf-8'), (
+        'Убедитесь, что авторизованный пользователь получает страницу, '
+        'отрендеренную для него.'
+    )
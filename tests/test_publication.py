@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_publication_horizon(
+        mixer: Mixer, user, published_category,
+        django_assert_num_queries):
+    from blog.publication import (
+        next_publication_at, publication_aware_timeout)
+
+    assert next_publication_at() is None
+    assert publication_aware_timeout(600) == 600
+
+    later = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=2))
+    assert next_publication_at() == later.pub_date, (
+        'Убедитесь, что горизонт публикаций сбрасывается '
+        'при сохранении публикации.'
+    )
+    with django_assert_num_queries(0):
+        assert next_publication_at() == later.pub_date
+
+    sooner = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=60))
+    assert next_publication_at() == sooner.pub_date
+    assert publication_aware_timeout(600) <= 61
+
+    published_category.is_published = False
+    published_category.save()
+    assert next_publication_at() is None, (
+        'Убедитесь, что отложенные публикации скрытой категории '
+        'не учитываются.'
+    )
+
+
+def test_publication_horizon_refreshes_after_it_passes(
+        mixer: Mixer, user, published_category):
+    from django.core.cache import cache
+
+    from blog.publication import HORIZON_CACHE_KEY, next_publication_at
+
+    later = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1))
+    cache.set(HORIZON_CACHE_KEY, timezone.now() - timedelta(seconds=1))
+    assert next_publication_at() == later.pub_date
+
+
+def test_publication_horizon_expires(
+        settings, mixer: Mixer, user, published_category):
+    from blog.models import Post
+    from blog.publication import next_publication_at
+
+    settings.BLOG_HORIZON_CACHE_TIMEOUT = 0
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(hours=1))
+    assert next_publication_at() is None
+    # update() не отправляет сигналы, и горизонт не сбрасывается.
+    later = timezone.now() + timedelta(hours=1)
+    Post.objects.filter(pk=post.pk).update(pub_date=later)
+    assert next_publication_at() == later, (
+        'Убедитесь, что горизонт публикаций хранится в кэше '
+        'ограниченное время.'
+    )
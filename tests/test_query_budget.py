@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.test import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+N_POSTS = 1000
+N_COMMENTS = 200
+
+
+@pytest.fixture
+def scaled_posts(mixer: Mixer, user):
+    from blog.models import Comment, Post
+
+    authors = [user] + mixer.cycle(9).blend('auth.User')
+    categories = mixer.cycle(5).blend('blog.Category', is_published=True)
+    locations = mixer.cycle(5).blend('blog.Location', is_published=True)
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {i}',
+            text='Текст публикации ' * 20,
+            pub_date=now - timedelta(minutes=i),
+            author=authors[i % len(authors)],
+            category=categories[i % len(categories)],
+            location=locations[i % len(locations)],
+        )
+        for i in range(N_POSTS)
+    )
+    post = Post.objects.filter(author=user).first()
+    Comment.objects.bulk_create(
+        Comment(post=post, author=authors[i % len(authors)], text='Текст')
+        for i in range(N_COMMENTS)
+    )
+    return post
+
+
+@pytest.fixture
+def budget_urls(scaled_posts):
+    post = scaled_posts
+    return [
+        ('blog:index', '/'),
+        ('blog:index', '/?page=50'),
+        ('blog:index', '/?cursor='),
+        ('blog:category_posts', f'/category/{post.category.slug}/'),
+        ('blog:category_posts', f'/category/{post.category.slug}/?page=20'),
+        ('blog:profile', f'/profile/{post.author.username}/'),
+        ('blog:profile', f'/profile/{post.author.username}/?page=5'),
+        ('blog:post_detail', f'/posts/{post.id}/'),
+        ('blog:post_detail', f'/posts/{post.id}/?comments='),
+        ('blog:comment_list', f'/posts/{post.id}/comments/'),
+        ('blog:post_create', '/posts/create/'),
+        ('blog:edit_post', f'/posts/{post.id}/edit/'),
+        ('blog:edit_profile', f'/profile/{post.author.username}/edit/'),
+        ('pages:about', '/pages/about/'),
+        ('pages:rules', '/pages/rules/'),
+    ]
+
+
+@pytest.fixture
+def budget_write_requests(scaled_posts, user):
+    from blog.models import Comment
+
+    post = scaled_posts
+    comment = Comment.objects.filter(post=post, author=user).first()
+    edit_url = f'/posts/{post.id}/edit_comment/{comment.id}/'
+    delete_url = f'/posts/{post.id}/delete_comment/{comment.id}/'
+    # Порядок важен: публикация удаляется вместе с комментариями.
+    return [
+        ('blog:add_comment', 'post', f'/posts/{post.id}/comment/',
+         {'text': 'Новый комментарий'}),
+        ('blog:edit_comment', 'get', edit_url, {}),
+        ('blog:edit_comment', 'post', edit_url, {'text': 'Исправленный'}),
+        ('blog:delete_comment', 'get', delete_url, {}),
+        ('blog:delete_comment', 'post', delete_url, {}),
+        ('blog:delete_post', 'get', f'/posts/{post.id}/delete/', {}),
+        ('blog:delete_post', 'post', f'/posts/{post.id}/delete/', {}),
+    ]
+
+
+def assert_fits_budget(client, view_name, url, method='get', data=None):
+    from blog.instrumentation import get_view_stats, reset_view_stats
+
+    reset_view_stats()
+    response = getattr(client, method)(url, data=data or {})
+    assert response.status_code in (200, 302), (
+        f'Убедитесь, что страница {url} загружается без ошибок.')
+    stats = get_view_stats()
+    assert view_name in stats, (
+        f'Убедитесь, что для страницы {url} записывается '
+        'статистика SQL-запросов.'
+    )
+    queries = stats[view_name].last_queries
+    budget = settings.BLOG_QUERY_BUDGETS[view_name]
+    assert queries <= budget, (
+        f'Страница {url} ({view_name}) выполнила {queries} '
+        f'SQL-запросов при бюджете {budget}.'
+    )
+
+
+@pytest.mark.parametrize('client_fixture', ['user_client', 'client'])
+def test_views_fit_query_budget(request, client_fixture, budget_urls):
+    client: Client = request.getfixturevalue(client_fixture)
+    for view_name, url in budget_urls:
+        assert_fits_budget(client, view_name, url)
+
+
+def test_write_views_fit_query_budget(
+        user_client: Client, budget_write_requests):
+    for view_name, method, url, data in budget_write_requests:
+        assert_fits_budget(user_client, view_name, url, method, data)
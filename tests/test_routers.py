@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.models import Comment, Job, Post
+from blog.routers import (
+    PrimaryReplicaRouter, ReplicaReadMiddleware, read_from_replica)
+
+
+@pytest.fixture
+def replica(settings):
+    settings.BLOG_REPLICA_ALIAS = 'replica'
+    return 'replica'
+
+
+def test_reads_go_to_replica_only_when_allowed(replica):
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == 'default', (
+        'Убедитесь, что вне запроса чтение идёт из основной базы.'
+    )
+    with read_from_replica():
+        assert router.db_for_read(Post) == replica
+        assert router.db_for_read(Comment) == replica
+        assert router.db_for_read(Job) == 'default'
+        assert router.db_for_read(get_user_model()) == 'default'
+        assert router.db_for_write(Post) == 'default'
+    assert router.db_for_read(Post) == 'default'
+
+
+def test_router_without_replica(settings):
+    settings.BLOG_REPLICA_ALIAS = None
+    with read_from_replica():
+        assert PrimaryReplicaRouter().db_for_read(Post) == 'default'
+
+
+def _routing_middleware():
+    routed = []
+
+    def get_response(request):
+        routed.append(PrimaryReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    return ReplicaReadMiddleware(get_response), routed
+
+
+def test_writes_pin_client_to_primary(replica, settings):
+    middleware, routed = _routing_middleware()
+    factory = RequestFactory()
+
+    middleware(factory.get('/'))
+    response = middleware(factory.post('/posts/create/'))
+    assert routed == [replica, 'default'], (
+        'Убедитесь, что безопасные запросы читают с реплики, '
+        'а запросы на изменение — из основной базы.'
+    )
+    cookie = response.cookies[settings.BLOG_PRIMARY_PIN_COOKIE]
+    assert cookie['max-age'] == settings.BLOG_PRIMARY_PIN_SECONDS
+
+    request = factory.get('/')
+    request.COOKIES[settings.BLOG_PRIMARY_PIN_COOKIE] = '1'
+    middleware(request)
+    assert routed[-1] == 'default', (
+        'Убедитесь, что после изменения клиент читает свои данные '
+        'из основной базы.'
+    )
+
+
+def test_async_middleware_routes_reads(replica):
+    routed = []
+
+    async def get_response(request):
+        routed.append(PrimaryReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    middleware = ReplicaReadMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    asyncio.run(middleware(RequestFactory().get('/')))
+    assert routed == [replica]
+
+
+@pytest.mark.django_db
+def test_page_cache_is_filled_from_primary(replica):
+    from django.contrib.auth.models import AnonymousUser
+
+    from blog.cache import cache_anonymous_page
+
+    routed = []
+
+    @cache_anonymous_page(lambda: [('feed', 'index')])
+    def view(request):
+        routed.append(PrimaryReplicaRouter().db_for_read(Post))
+        return HttpResponse('page')
+
+    request = RequestFactory().get('/replica-test/')
+    request.user = AnonymousUser()
+    with read_from_replica():
+        view(request)
+        assert view(request).content == b'page'
+    assert routed == ['default'], (
+        'Убедитесь, что страница для кэша читается из основной базы, '
+        'а не из отстающей реплики.'
+    )
+
+
+@pytest.mark.django_db
+def test_cached_count_is_computed_on_primary(replica):
+    from blog.paginators import CachedCountPaginator
+
+    paginator = CachedCountPaginator(
+        Post.objects.all(), 10, count_scopes=[('feed', 'index')])
+    with read_from_replica():
+        assert paginator.count == 0
@@ -0,0 +1,76 @@
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user, published_category):
+    from blog.tasks import run_pending_jobs
+
+    posts = {
+        'title': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Путешествие по горам', text='Короткий рассказ.'),
+        'text': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Заметки', text='Мы долго шли к горе Эльбрус.'),
+        'hidden': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Горы зимой', text='Черновик.', is_published=False),
+        'other': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Рецепт пирога', text='Мука, сахар, яйца.'),
+    }
+    run_pending_jobs()
+    return posts
+
+
+def test_stemmer():
+    from blog.search import stem
+
+    assert stem('горами') == stem('горы') == stem('гора')
+    assert stem('публикации') == stem('публикация')
+    assert stem('Django') == 'django'
+
+
+def test_search_ranks_visible_posts(client: Client, searchable_posts):
+    response = client.get('/search/', {'q': 'гора'})
+    assert response.status_code == 200
+    found = list(response.context['page_obj'])
+    assert found == [searchable_posts['title'], searchable_posts['text']], (
+        'Убедитесь, что поиск находит словоформы запроса, ставит выше '
+        'совпадения в заголовке и не показывает скрытые публикации.'
+    )
+    assert client.get('/search/', {'q': ''}).context['page_obj'] \
+        .paginator.count == 0
+
+
+def test_search_index_follows_edits(
+        client: Client, searchable_posts):
+    from blog.tasks import run_pending_jobs
+
+    post = searchable_posts['other']
+    post.text = 'Пирог с видом на горы.'
+    post.save()
+    run_pending_jobs()
+    response = client.get('/search/', {'q': 'горы'})
+    assert post in response.context['page_obj'], (
+        'Убедитесь, что индекс обновляется при изменении публикации.'
+    )
+
+    post.delete()
+    response = client.get('/search/', {'q': 'пирог'})
+    assert response.context['page_obj'].paginator.count == 0
+
+
+def test_rebuild_search_index(searchable_posts):
+    from django.core.management import call_command
+
+    from blog.search import SearchResults
+
+    call_command('rebuild_search_index', batch_size=2)
+    assert SearchResults('рассказ').count() == 1
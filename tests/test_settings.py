@@ -0,0 +1,69 @@
+import importlib
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def test_env_helpers(monkeypatch):
+    from blogicum.settings.env import env_bool, env_int, env_list
+
+    monkeypatch.setenv('BLOGICUM_TEST_FLAG', 'on')
+    monkeypatch.setenv('BLOGICUM_TEST_NUMBER', '42')
+    monkeypatch.setenv('BLOGICUM_TEST_LIST', 'a.ru, b.ru,')
+    assert env_bool('BLOGICUM_TEST_FLAG') is True
+    assert env_bool('BLOGICUM_TEST_MISSING', True) is True
+    assert env_int('BLOGICUM_TEST_NUMBER') == 42
+    assert env_list('BLOGICUM_TEST_LIST') == ['a.ru', 'b.ru']
+    monkeypatch.setenv('BLOGICUM_TEST_FLAG', 'maybe')
+    with pytest.raises(ImproperlyConfigured):
+        env_bool('BLOGICUM_TEST_FLAG')
+
+
+SHARED_CACHE = 'django.core.cache.backends.memcached.PyMemcacheCache'
+
+
+def _load_prod():
+    importlib.reload(importlib.import_module('blogicum.settings.base'))
+    module = importlib.import_module('blogicum.settings.prod')
+    return importlib.reload(module)
+
+
+@pytest.fixture
+def prod_environment(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'production-secret')
+    monkeypatch.setenv('DJANGO_CACHE_BACKEND', SHARED_CACHE)
+    monkeypatch.setenv('DJANGO_CACHE_LOCATION', '127.0.0.1:11211')
+    yield monkeypatch
+    monkeypatch.undo()
+    importlib.reload(importlib.import_module('blogicum.settings.base'))
+
+
+def test_production_settings_read_environment(prod_environment):
+    prod_environment.setenv('DJANGO_DB_CONN_MAX_AGE', '300')
+    prod_environment.setenv('DJANGO_TEMPLATE_CACHE', 'off')
+    prod = _load_prod()
+    assert prod.DEBUG is False
+    assert prod.SECRET_KEY == 'production-secret'
+    assert prod.DATABASES['default']['CONN_MAX_AGE'] == 300
+    assert prod.CACHES['default']['BACKEND'] == SHARED_CACHE
+    assert 'loaders' not in prod.TEMPLATES[0]['OPTIONS']
+    assert prod.BLOG_TASKS_WORKER and not prod.BLOG_TASKS_EAGER, (
+        'Убедитесь, что в продакшене фоновые задачи по умолчанию '
+        'выполняет обработчик `run_jobs`, а не поток запроса.'
+    )
+    assert django_settings.DATABASES['default']['CONN_MAX_AGE'] == 0, (
+        'Убедитесь, что профиль prod не изменяет настройки '
+        'среды разработки.'
+    )
+
+
+@pytest.mark.parametrize('variable, value', [
+    ('DJANGO_SECRET_KEY', ''),
+    ('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+])
+def test_production_settings_require_secrets_and_shared_cache(
+        prod_environment, variable, value):
+    prod_environment.setenv(variable, value)
+    with pytest.raises(ImproperlyConfigured):
+        _load_prod()
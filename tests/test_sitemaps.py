@@ -0,0 +1,88 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def sitemap_dir(settings, tmp_path):
+    settings.BLOG_SITEMAP_DIR = tmp_path
+    settings.BLOG_SITE_URL = 'https://blogicum.test'
+    return tmp_path
+
+
+@pytest.fixture
+def sitemap_posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1))
+
+
+def generate(**options):
+    output = io.StringIO()
+    call_command('generate_sitemaps', stdout=output, **options)
+    return output.getvalue()
+
+
+def test_sitemaps_are_generated(sitemap_dir, sitemap_posts, user):
+    assert 'Записано файлов: 3' in generate()
+    index = (sitemap_dir / 'sitemap.xml').read_text()
+    for name in ('posts', 'categories', 'profiles'):
+        assert (
+            f'https://blogicum.test/sitemaps/sitemap-{name}-1.xml' in index
+        ), 'Убедитесь, что индекс карты сайта ссылается на все разделы.'
+    posts = (sitemap_dir / 'sitemap-posts-1.xml').read_text()
+    for post in sitemap_posts:
+        assert f'https://blogicum.test/posts/{post.pk}/' in posts
+    profiles = (sitemap_dir / 'sitemap-profiles-1.xml').read_text()
+    assert f'/profile/{user.username}/' in profiles
+
+
+def test_sitemaps_are_incremental(sitemap_dir, sitemap_posts):
+    generate()
+    assert 'Записано файлов: 0, без изменений: 3' in generate(), (
+        'Убедитесь, что неизменившиеся разделы карты сайта '
+        'не перезаписываются.'
+    )
+
+    post = sitemap_posts[0]
+    post.is_published = False
+    post.save()
+    assert 'Записано файлов: 1, без изменений: 2' in generate()
+    posts = (sitemap_dir / 'sitemap-posts-1.xml').read_text()
+    assert f'/posts/{post.pk}/' not in posts
+
+    assert 'Записано файлов: 3' in generate(force=True)
+
+
+def test_sitemaps_follow_renamed_slugs(sitemap_dir, sitemap_posts):
+    generate()
+    category = sitemap_posts[0].category
+    category.slug = 'renamed'
+    category.save()
+    generate()
+    categories = (sitemap_dir / 'sitemap-categories-1.xml').read_text()
+    assert '/category/renamed/' in categories, (
+        'Убедитесь, что смена slug категории обновляет карту сайта.'
+    )
+
+
+def test_sitemap_view(client: Client, sitemap_dir, sitemap_posts):
+    assert client.get('/sitemap.xml').status_code == 404
+    generate()
+    response = client.get('/sitemap.xml')
+    assert response.status_code == 200
+    assert b'sitemap-posts-1.xml' in b''.join(response.streaming_content)
+    response = client.get(
+        '/sitemaps/sitemap-posts-1.xml',
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == 304
+    assert client.get('/sitemaps/manifest.json').status_code == 404
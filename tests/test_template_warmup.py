@@ -0,0 +1,57 @@
+import importlib
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+from django.template import engines
+
+
+def _project_templates():
+    templates_dir = django_settings.TEMPLATES[0]['DIRS'][0]
+    return {
+        path.relative_to(templates_dir).as_posix()
+        for path in templates_dir.rglob('*.html')
+    }
+
+
+@pytest.fixture
+def prod(monkeypatch):
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'production-secret')
+    monkeypatch.setenv(
+        'DJANGO_CACHE_BACKEND',
+        'django.core.cache.backends.memcached.PyMemcacheCache')
+    return importlib.reload(importlib.import_module('blogicum.settings.prod'))
+
+
+def test_warm_up_compiles_all_templates():
+    from blogicum.warmup import warm_up_templates
+
+    loaded, failed = warm_up_templates()
+    assert failed == []
+    assert loaded == len(_project_templates())
+
+
+def test_production_profile_caches_templates(settings, prod):
+    from blogicum.warmup import warm_up_templates
+
+    assert not prod.DEBUG
+    settings.TEMPLATES = prod.TEMPLATES
+    warm_up_templates()
+    loader = engines['django'].engine.template_loaders[0]
+    assert loader.__module__ == 'django.template.loaders.cached'
+    for name in ('includes/post_card.html', 'includes/paginator.html',
+                 'includes/comments.html', 'includes/category_link.html'):
+        assert name in loader.get_template_cache, (
+            f'Убедитесь, что шаблон {name} компилируется при прогреве '
+            'и остаётся в кэше загрузчика.'
+        )
+
+
+def test_warmup_templates_command(capsys):
+    call_command('warmup_templates')
+    assert str(len(_project_templates())) in capsys.readouterr().out
+
+
+def test_dev_settings_are_not_changed_by_production_profile(prod):
+    assert 'loaders' not in django_settings.TEMPLATES[0]['OPTIONS']
+    assert django_settings.TEMPLATES[0]['APP_DIRS']
@@ -0,0 +1,89 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+from PIL import Image
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def post_with_large_image(mixer: Mixer, user, published_category, media_root):
+    buffer = BytesIO()
+    Image.new('RGB', (2000, 1000), 'red').save(buffer, 'JPEG')
+    image = SimpleUploadedFile(
+        'large.jpg', buffer.getvalue(), content_type='image/jpeg')
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category, image=image)
+
+
+def test_post_image_variants(post_with_large_image, media_root):
+    from blog.images import IMAGE_VARIANTS, generate_image_variants
+
+    post = post_with_large_image
+    assert post.image_srcset == ''
+    assert post.image_thumbnail_url == post.image.url, (
+        'Убедитесь, что до создания уменьшенных копий в ленте '
+        'выводится оригинальное изображение.'
+    )
+
+    variants = generate_image_variants(post.image.name)
+    for files in variants['formats'].values():
+        assert len(files) == len(IMAGE_VARIANTS)
+        for width, name in files:
+            with Image.open(media_root / name) as image:
+                assert image.width == width
+                assert image.format in ('JPEG', 'WEBP')
+
+    type(post).objects.filter(pk=post.pk).update(
+        image_variant_files=variants)
+    post = type(post).objects.get(pk=post.pk)
+    assert post.image_thumbnail_url.endswith('.thumb.jpg')
+    assert post.image_detail_url.endswith('.detail.jpg')
+    assert '640w' in post.image_srcset
+    assert '1280w' in post.image_webp_srcset
+
+
+def test_srcset_uses_real_widths(
+        mixer: Mixer, user, published_category, media_root):
+    from blog.images import generate_image_variants
+
+    buffer = BytesIO()
+    Image.new('RGB', (800, 600), 'blue').save(buffer, 'JPEG')
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=SimpleUploadedFile(
+            'small.jpg', buffer.getvalue(), content_type='image/jpeg'))
+    post.image_variant_files = generate_image_variants(post.image.name)
+    assert post.image_srcset.endswith('.detail.jpg 800w'), (
+        'Убедитесь, что в srcset указана настоящая ширина копии, '
+        'а не целевая.'
+    )
+    assert '1280w' not in post.image_webp_srcset
+
+
+def test_generate_thumbnails_command(post_with_large_image, media_root):
+    from blog.images import variant_name
+
+    post = post_with_large_image
+    call_command('generate_thumbnails')
+    assert (media_root / variant_name(
+        post.image.name, 'thumb', 'webp')).exists(), (
+        'Убедитесь, что команда `generate_thumbnails` создаёт '
+        'уменьшенные копии изображений.'
+    )
+    post.refresh_from_db()
+    assert '.thumb.webp 640w' in post.image_webp_srcset, (
+        'Убедитесь, что команда `generate_thumbnails` сохраняет '
+        'созданные копии в публикации.'
+    )